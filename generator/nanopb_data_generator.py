@@ -20,10 +20,16 @@ Example usage:
 
 import os
 import sys
+import hashlib
+import tempfile
+import functools
+import contextlib
+import itertools
+import importlib.util
 import struct
 import random
 import string
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -31,23 +37,391 @@ from enum import Enum
 # files built with older protoc versions (avoids descriptor runtime errors).
 os.environ.setdefault('PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION', 'python')
 
-# Import protobuf libraries
-try:
-    from google.protobuf import descriptor_pb2
-    from google.protobuf.message import Message
-except ImportError:
-    sys.stderr.write("Error: protobuf library required. Install with: pip install protobuf\n")
-    sys.exit(1)
-
-# Import nanopb modules
-try:
-    from . import nanopb_validator
-    from .proto._utils import invoke_protoc
-    from .proto import TemporaryDirectory
-except ImportError:
-    import nanopb_validator
-    from proto._utils import invoke_protoc
-    from proto import TemporaryDirectory
+# The protobuf library and the nanopb proto helpers are imported by
+# _import_dependencies() when the first DataGenerator is created, so that
+# the command line can print usage and argument errors without them.
+descriptor_pb2 = None
+invoke_protoc = None
+TemporaryDirectory = None
+
+
+def _import_dependencies():
+    """Import the protobuf library and nanopb proto helpers on first call."""
+    global descriptor_pb2, invoke_protoc, TemporaryDirectory
+    if descriptor_pb2 is not None:
+        return
+
+    # Import protobuf libraries
+    try:
+        from google.protobuf import descriptor_pb2 as module
+    except ImportError:
+        sys.stderr.write("Error: protobuf library required. Install with: pip install protobuf\n")
+        sys.exit(1)
+
+    # Import nanopb modules
+    try:
+        from .proto._utils import invoke_protoc
+        from .proto import TemporaryDirectory
+    except ImportError:
+        from proto._utils import invoke_protoc
+        from proto import TemporaryDirectory
+
+    descriptor_pb2 = module
+
+
+# Field type names, indexed by FieldDescriptorProto.Type
+_TYPE_NAMES = (
+    'unknown', 'double', 'float', 'int64', 'uint64',
+    'int32', 'fixed64', 'fixed32', 'bool',
+    'string', 'group', 'message', 'bytes',
+    'uint32', 'enum', 'sfixed32', 'sfixed64',
+    'sint32', 'sint64'
+)
+
+# protoc output is cached here between runs, see DataGenerator._load_descriptor_set()
+_DESCRIPTOR_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'nanopb', 'descriptors'
+)
+
+# Parsed FileDescriptorSets, keyed by (proto path, mtime, include paths)
+_DESCRIPTOR_SETS = {}
+
+
+def _descriptor_cache_dir() -> Optional[str]:
+    """Return the descriptor cache directory, creating it if needed.
+
+    The directory is private to the user. None is returned if it cannot
+    be created, or if it is owned by another user, in which case its
+    contents are not trusted.
+    """
+    try:
+        os.makedirs(_DESCRIPTOR_CACHE_DIR, mode=0o700, exist_ok=True)
+        st = os.stat(_DESCRIPTOR_CACHE_DIR)
+        if hasattr(os, 'getuid'):
+            if st.st_uid != os.getuid():
+                return None
+            if st.st_mode & 0o077:
+                os.chmod(_DESCRIPTOR_CACHE_DIR, 0o700)
+    except OSError:
+        return None
+    return _DESCRIPTOR_CACHE_DIR
+
+# Rules understood by the generator for each (validate.rules) type.
+# Field names follow validate.proto, except that const_value is stored as 'const'.
+_NUMERIC_RULES = frozenset(('const_value', 'lt', 'lte', 'gt', 'gte', 'in', 'not_in'))
+_STRING_RULES = frozenset(('const_value', 'min_len', 'max_len', 'prefix', 'suffix', 'contains',
+                           'in', 'not_in', 'ascii', 'email', 'hostname', 'ip', 'ipv4', 'ipv6'))
+_BYTES_RULES = frozenset(('const_value', 'min_len', 'max_len'))
+_BOOL_RULES = frozenset(('const_value',))
+_REPEATED_RULES = frozenset(('min_items', 'max_items', 'unique'))
+
+# Boolean rules that only apply when set to true
+_FLAG_RULES = frozenset(('ascii', 'email', 'hostname', 'ip', 'ipv4', 'ipv6', 'unique'))
+
+_RULE_NAMES = {'const_value': 'const'}
+
+# Field type name -> (FieldRules member, rules handled for it)
+_TYPE_RULES = {
+    'int32': ('int32', _NUMERIC_RULES),
+    'int64': ('int64', _NUMERIC_RULES),
+    'uint32': ('uint32', _NUMERIC_RULES),
+    'uint64': ('uint64', _NUMERIC_RULES),
+    'sint32': ('sint32', _NUMERIC_RULES),
+    'sint64': ('sint64', _NUMERIC_RULES),
+    'float': ('float', _NUMERIC_RULES),
+    'double': ('double', _NUMERIC_RULES),
+    'bool': ('bool', _BOOL_RULES),
+    'string': ('string', _STRING_RULES),
+    'bytes': ('bytes', _BYTES_RULES),
+}
+
+
+# Set by DataGenerator._ensure_validate_pb2(), so that a failed build of
+# validate_pb2 is not retried for every generator
+_validate_pb2_build_attempted = False
+
+# Set by _ensure_validate_pb2_imported()
+validate_pb2 = None
+_VALIDATE_RULES_EXT = None
+_validate_pb2_imported = False
+
+
+def _ensure_validate_pb2_imported():
+    """Import validate_pb2 on first call and look up the (validate.rules) extension.
+
+    Returns the extension, or None if validate_pb2 is not available.
+    """
+    global validate_pb2, _VALIDATE_RULES_EXT, _validate_pb2_imported
+    if _validate_pb2_imported:
+        return _VALIDATE_RULES_EXT
+    _validate_pb2_imported = True
+
+    try:
+        from .proto import validate_pb2 as module
+    except ImportError:
+        try:
+            from proto import validate_pb2 as module
+        except ImportError:
+            try:
+                import validate_pb2 as module
+            except ImportError:
+                module = None
+
+    validate_pb2 = module
+    _VALIDATE_RULES_EXT = getattr(module, 'rules', None)
+    return _VALIDATE_RULES_EXT
+
+
+# Attempts at drawing a value that is not in a not_in list before giving up
+_NOT_IN_RETRIES = 100
+
+
+def _random_ints(rng, constraints, min_val, max_val, count, max_span=None):
+    """Draw count random integers in [min_val, max_val] satisfying numeric rules.
+
+    This is the common kernel of the integer generators, used directly for
+    repeated fields so that the bounds are worked out once per field rather
+    than once per item. min_val and max_val are the limits of the field
+    type. If max_span is given, the range is cut to that many values above
+    the lower bound.
+    """
+    if 'const' in constraints:
+        return [int(constraints['const'])] * count
+
+    # The rule fields have the same type as the field, so a bound that is
+    # present always lies within the type limits and replaces them directly.
+    bound = constraints.get('gte')
+    if bound is not None:
+        min_val = int(bound)
+    else:
+        bound = constraints.get('gt')
+        if bound is not None:
+            min_val = int(bound) + 1
+
+    bound = constraints.get('lte')
+    if bound is not None:
+        max_val = int(bound)
+    else:
+        bound = constraints.get('lt')
+        if bound is not None:
+            max_val = int(bound) - 1
+
+    if 'in' in constraints:
+        allowed = constraints['in']
+        return rng.choices(allowed, k=count)
+
+    if max_span is not None and max_val - min_val > max_span:
+        max_val = min_val + max_span
+
+    randint = rng.randint
+    not_in = constraints.get('not_in')
+    if not not_in:
+        return [randint(min_val, max_val) for _ in range(count)]
+
+    values = []
+    for _ in range(count):
+        value = randint(min_val, max_val)
+        for _ in range(_NOT_IN_RETRIES):
+            if value not in not_in:
+                break
+            value = randint(min_val, max_val)
+        values.append(value)
+    return values
+
+
+def _random_floats(rng, constraints, min_val, max_val, count):
+    """Draw count random floats in [min_val, max_val] satisfying numeric rules."""
+    if 'const' in constraints:
+        return [float(constraints['const'])] * count
+
+    bound = constraints.get('gte')
+    if bound is not None:
+        min_val = float(bound)
+    else:
+        bound = constraints.get('gt')
+        if bound is not None:
+            min_val = float(bound) + 0.01
+
+    bound = constraints.get('lte')
+    if bound is not None:
+        max_val = float(bound)
+    else:
+        bound = constraints.get('lt')
+        if bound is not None:
+            max_val = float(bound) - 0.01
+
+    if 'in' in constraints:
+        allowed = constraints['in']
+        return rng.choices(allowed, k=count)
+
+    uniform = rng.uniform
+    not_in = constraints.get('not_in')
+    if not not_in:
+        return [uniform(min_val, max_val) for _ in range(count)]
+
+    values = []
+    for _ in range(count):
+        value = uniform(min_val, max_val)
+        for _ in range(_NOT_IN_RETRIES):
+            if value not in not_in:
+                break
+            value = uniform(min_val, max_val)
+        values.append(value)
+    return values
+
+
+# Type name -> (min, max, max_span) for the integer generators. For 64-bit
+# types only a window of 10**9 values above the lower bound is used, to
+# generate reasonable values.
+_INT_LIMITS = {
+    'int32': (-(2**31), 2**31 - 1, None),
+    'sint32': (-(2**31), 2**31 - 1, None),
+    'int64': (-(2**63), 2**63 - 1, 10**9),
+    'sint64': (-(2**63), 2**63 - 1, 10**9),
+    'uint32': (0, 2**32 - 1, None),
+    'uint64': (0, 2**64 - 1, 10**9),
+}
+
+# Type name -> (min, max) for the floating point generators
+_FLOAT_LIMITS = {
+    'float': (-3.4e38, 3.4e38),
+    'double': (-1.7e308, 1.7e308),
+}
+
+# Character pools for the string generators
+_CHARS_ASCII_ALNUM = string.ascii_letters + string.digits
+_CHARS_ASCII_ALL = _CHARS_ASCII_ALNUM + string.punctuation
+_CHARS_EMAIL_LOCAL = _CHARS_ASCII_ALNUM + '._-'
+_CHARS_HOSTNAME_LABEL = string.ascii_lowercase + string.digits + '-'
+
+
+# Rule type -> fixed string that violates it
+_INVALID_STRINGS = {
+    'contains': 'DOES_NOT_CONTAIN_REQUIRED',    # String without required substring
+    'ascii': 'test_中文_invalid',               # Non-ASCII string
+    'email': 'invalid-email-without-at',        # Not a valid email
+    'hostname': '-bad_host_name-',              # Illegal chars / formatting
+    'ip': '999.999.999.999',                    # Not an IP format
+    'ipv4': '256.300.1.2',                      # Invalid IPv4
+    'ipv6': 'gggg:gggg:gggg:gggg:gggg:gggg:gggg:gggg',  # Non-hex IPv6
+}
+
+
+def _c_hex_literals(data: bytes) -> str:
+    """Format data as comma-separated C hex literals, e.g. '0x08, 0x4b'."""
+    if not data:
+        return ''
+    # bytes.hex() with a separator does the per-byte work in C
+    return '0x' + data.hex(',').replace(',', ', 0x')
+
+
+# Number of data bytes formatted at a time when writing output to a file
+_OUTPUT_CHUNK = 65536
+
+
+def _write_varint(buf: bytearray, value: int) -> None:
+    """Append value to buf as a varint.
+
+    Negative values are written as 64-bit two's complement, like protobuf
+    does for int32 and int64.
+    """
+    if value < 0:
+        value += (1 << 64)
+    elif value < 0x80:
+        buf.append(value)
+        return
+    elif value < 0x4000:
+        # Two bytes, which covers lengths below 16 KiB and the tags of
+        # field numbers up to 2047
+        buf.append((value & 0x7f) | 0x80)
+        buf.append(value >> 7)
+        return
+    while value > 0x7f:
+        buf.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _zigzag_writer(shift: int):
+    """Return a function appending a value as a ZigZag varint.
+
+    shift is the sign bit position, 31 for sint32 and 63 for sint64.
+    """
+    def write(buf: bytearray, value: int) -> None:
+        # ZigZag output is never negative, so the varint loop is inlined
+        # without the two's complement adjustment of _write_varint().
+        value = (value << 1) ^ (value >> shift)
+        while value > 0x7f:
+            buf.append((value & 0x7f) | 0x80)
+            value >>= 7
+        buf.append(value)
+
+    return write
+
+
+def _write_bool(buf: bytearray, value: Any) -> None:
+    """Append a bool value to buf as a varint."""
+    buf.append(1 if value else 0)
+
+
+def _write_string(buf: bytearray, value: str) -> None:
+    """Append a length-delimited UTF-8 string to buf."""
+    data = value.encode('utf-8')
+    _write_varint(buf, len(data))
+    buf += data
+
+
+def _write_bytes(buf: bytearray, value: bytes) -> None:
+    """Append a length-delimited bytes value to buf."""
+    _write_varint(buf, len(value))
+    buf += value
+
+
+def _fixed_writer(fmt: str):
+    """Return a function appending a value packed with struct format fmt."""
+    pack = struct.Struct(fmt).pack
+
+    def write(buf: bytearray, value: Any) -> None:
+        buf += pack(value)
+
+    return write
+
+
+# Field type -> (wire type, value writer)
+# Wire types: 0=varint, 1=64bit, 2=length-delimited, 5=32bit
+_FIELD_CODECS = {
+    1: (1, _fixed_writer('<d')),     # double
+    2: (5, _fixed_writer('<f')),     # float
+    3: (0, _write_varint),           # int64
+    4: (0, _write_varint),           # uint64
+    5: (0, _write_varint),           # int32
+    6: (1, _fixed_writer('<Q')),     # fixed64
+    7: (5, _fixed_writer('<I')),     # fixed32
+    8: (0, _write_bool),             # bool
+    9: (2, _write_string),           # string
+    12: (2, _write_bytes),           # bytes
+    13: (0, _write_varint),          # uint32
+    15: (5, _fixed_writer('<i')),    # sfixed32
+    16: (1, _fixed_writer('<q')),    # sfixed64
+    17: (0, _zigzag_writer(31)),     # sint32
+    18: (0, _zigzag_writer(63)),     # sint64
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _split_csv(value: str) -> Tuple[str, ...]:
+    """Split a comma-separated string into its non-empty, stripped parts."""
+    return tuple(part.strip() for part in value.split(',') if part.strip())
+
+
+def _normalize_csv_arg(arg: Union[str, List[str]]) -> Tuple[str, ...]:
+    """Normalize a string, comma-separated string or list of them into a tuple of names."""
+    if isinstance(arg, str):
+        return _split_csv(arg)
+    return tuple(itertools.chain.from_iterable(
+        _split_csv(item) for item in arg if isinstance(item, str)
+    ))
 
 
 class OutputFormat(Enum):
@@ -58,9 +432,34 @@ class OutputFormat(Enum):
     HEX_STRING = "hex_string"
 
 
+# Command line format name -> OutputFormat
+_FORMAT_MAP = {
+    'binary': OutputFormat.BINARY,
+    'c_array': OutputFormat.C_ARRAY,
+    'hex': OutputFormat.HEX_STRING,
+    'dict': OutputFormat.PYTHON_DICT,
+}
+
+
+def _format_c_array(data: bytes, name: str) -> str:
+    """Format data as a C array definition followed by its size."""
+    hex_values = _c_hex_literals(data)
+    return f'const uint8_t {name}[] = {{{hex_values}}};\nconst size_t {name}_size = {len(data)};'
+
+
+# OutputFormat -> function(data, name) returning the formatted output
+_FORMATTERS = {
+    OutputFormat.BINARY: lambda data, name: data,
+    OutputFormat.HEX_STRING: lambda data, name: data.hex(),
+    OutputFormat.C_ARRAY: _format_c_array,
+    OutputFormat.PYTHON_DICT: lambda data, name: str(data),
+}
+
+
 @dataclass
 class ValidationConstraint:
     """Represents a validation constraint for a field."""
+    __slots__ = ('field_name', 'field_type', 'rule_type', 'value')
     field_name: str
     field_type: str
     rule_type: str
@@ -73,59 +472,133 @@ class ValidationConstraint:
 class ProtoFieldInfo:
     """Information about a protobuf field."""
     
+    __slots__ = (
+        'name', 'number', 'type', 'type_name', 'label', 'descriptor', 'type_name_str',
+        'constraints', 'constraints_dict',
+        'item_constraints_dict', 'constraint_rules_set', 'tag_bytes', 'write_value',
+    )
+    
     def __init__(self, field_desc):
-        self.name = field_desc.name
+        self.name = sys.intern(field_desc.name)
         self.number = field_desc.number
         self.type = field_desc.type
         self.type_name = field_desc.type_name
         self.label = field_desc.label
         self.descriptor = field_desc
+        self.type_name_str = _TYPE_NAMES[self.type] if 0 < self.type < len(_TYPE_NAMES) else 'unknown'
         
-        # Parse validation rules
+        # Encoded tag and value writer, both None for unsupported types
+        codec = _FIELD_CODECS.get(self.type)
+        if codec is None:
+            self.tag_bytes = self.write_value = None
+        else:
+            wire_type, self.write_value = codec
+            tag = bytearray()
+            _write_varint(tag, (self.number << 3) | wire_type)
+            self.tag_bytes = bytes(tag)
+        
+        # Parse validation rules. ByteSize() also counts unknown fields, so
+        # this only skips fields that have no options at all.
         self.constraints = []
-        if hasattr(field_desc, 'options') and field_desc.options:
+        if hasattr(field_desc, 'options') and field_desc.options.ByteSize():
             self._parse_validation_rules(field_desc.options)
+        self.constraints = tuple(self.constraints)
+        self.constraints_dict = {c.rule_type: c.value for c in self.constraints}
+        if 'not_in' in self.constraints_dict:
+            # Only used for membership tests
+            self.constraints_dict['not_in'] = frozenset(self.constraints_dict['not_in'])
+        # Rules that apply to each item of a repeated field
+        self.item_constraints_dict = {
+            rule_type: value for rule_type, value in self.constraints_dict.items()
+            if rule_type not in _REPEATED_RULES
+        }
+        self.constraint_rules_set = frozenset(c.rule_type for c in self.constraints)
     
     def _parse_validation_rules(self, field_options):
-        """Parse validation rules from field options."""
+        """Parse (validate.rules) from field options."""
         try:
-            parsed_rules = nanopb_validator.parse_validation_rules_from_serialized_options(field_options)
-            
-            for rule_type, rule_data in parsed_rules.items():
-                if rule_type == 'required':
-                    self.constraints.append(
-                        ValidationConstraint(self.name, self.get_type_name(), 'required', True)
-                    )
-                elif isinstance(rule_data, dict):
-                    for constraint_name, constraint_value in rule_data.items():
-                        self.constraints.append(
-                            ValidationConstraint(
-                                self.name,
-                                self.get_type_name(),
-                                constraint_name,
-                                constraint_value
-                            )
-                        )
+            if _VALIDATE_RULES_EXT is None:
+                return
+
+            if not field_options.HasExtension(_VALIDATE_RULES_EXT):
+                # The options may have been parsed before validate_pb2 was
+                # imported, in which case the extension is still an unknown
+                # field. Re-parse them so that it is recognized.
+                field_options = descriptor_pb2.FieldOptions.FromString(field_options.SerializeToString())
+                if not field_options.HasExtension(_VALIDATE_RULES_EXT):
+                    return
+            rules = field_options.Extensions[_VALIDATE_RULES_EXT]
+
+            if rules.required:
+                self.constraints.append(
+                    ValidationConstraint(self.name, self.get_type_name(), 'required', True)
+                )
+
+            if self.is_repeated():
+                if rules.HasField('repeated'):
+                    self._add_rules(rules.repeated, _REPEATED_RULES)
+                    if rules.repeated.HasField('items'):
+                        self._add_type_rules(rules.repeated.items)
+            else:
+                self._add_type_rules(rules)
         except Exception as e:
             # Validation parsing is optional
             pass
+
+    def _add_type_rules(self, rules):
+        """Add constraints from the FieldRules member matching the field type."""
+        entry = _TYPE_RULES.get(self.get_type_name())
+        if entry is not None and rules.HasField(entry[0]):
+            self._add_rules(getattr(rules, entry[0]), entry[1])
+
+    def _add_rules(self, typed_rules, handled):
+        """Add a constraint for each rule set in typed_rules.
+
+        Only the fields that are actually set are visited, instead of
+        probing every possible rule with HasField().
+        """
+        for field, value in typed_rules.ListFields():
+            rule_type = field.name
+            if rule_type not in handled:
+                continue
+            if rule_type in _FLAG_RULES and not value:
+                continue
+            if not isinstance(value, (bool, int, float, str, bytes)):
+                # Repeated rules such as 'in' and 'not_in'
+                value = tuple(value)
+            self.constraints.append(
+                ValidationConstraint(
+                    self.name,
+                    self.get_type_name(),
+                    # Interned, so that comparisons with the rule name literals
+                    # used by the generators are identity checks
+                    sys.intern(_RULE_NAMES.get(rule_type, rule_type)),
+                    value
+                )
+            )
     
     def get_type_name(self) -> str:
         """Get human-readable type name."""
-        type_map = {
-            1: 'double', 2: 'float', 3: 'int64', 4: 'uint64',
-            5: 'int32', 6: 'fixed64', 7: 'fixed32', 8: 'bool',
-            9: 'string', 10: 'group', 11: 'message', 12: 'bytes',
-            13: 'uint32', 14: 'enum', 15: 'sfixed32', 16: 'sfixed64',
-            17: 'sint32', 18: 'sint64'
-        }
-        return type_map.get(self.type, 'unknown')
+        return self.type_name_str
     
     def is_repeated(self) -> bool:
         """Check if field is repeated."""
         return self.label == 3  # LABEL_REPEATED
 
 
+@dataclass
+class MessageDesc:
+    """Parsed message: its fields as parallel tuples, plus lookups by name."""
+    __slots__ = ('descriptor', 'field_names', 'field_infos', 'fields',
+                 'constrained_infos', 'constrained_fields')
+    descriptor: Any
+    field_names: Tuple[str, ...]
+    field_infos: Tuple[ProtoFieldInfo, ...]
+    fields: Dict[str, ProtoFieldInfo]
+    constrained_infos: Tuple[ProtoFieldInfo, ...]
+    constrained_fields: Dict[str, ProtoFieldInfo]
+
+
 class DataGenerator:
     """Generates test data for protobuf messages with validation rules."""
     
@@ -142,18 +615,53 @@ class DataGenerator:
         self.file_descriptor = None
         self.message_descriptors = {}
         self.proto_module = None
+        # Per-instance RNG, so that generators do not share the global random state
+        self._rng = random.Random()
+        
+        # Scalar type name -> valid value generator
+        self._valid_dispatch = {
+            'int32': self._generate_valid_int32,
+            'int64': self._generate_valid_int64,
+            'uint32': self._generate_valid_uint32,
+            'uint64': self._generate_valid_uint64,
+            'sint32': self._generate_valid_int32,
+            'sint64': self._generate_valid_int64,
+            'float': self._generate_valid_float,
+            'double': self._generate_valid_double,
+            'bool': self._generate_valid_bool,
+            'string': self._generate_valid_string,
+            'bytes': self._generate_valid_bytes,
+        }
+        # Rule type -> invalid value generator, for rules not in _INVALID_STRINGS
+        self._invalid_dispatch = {
+            'const': self._generate_invalid_const,
+            'min_len': self._generate_invalid_min_len,
+            'max_len': self._generate_invalid_max_len,
+            'prefix': self._generate_invalid_prefix,
+            'suffix': self._generate_invalid_suffix,
+            'in': self._generate_invalid_in,
+            'not_in': self._generate_invalid_not_in,
+            'min_items': self._generate_invalid_min_items,
+            'max_items': self._generate_invalid_max_items,
+            'unique': self._generate_invalid_unique,
+        }
+        # String constraint set -> specialized generator
+        self._string_generators = {}
+        # id() of a ValidationConstraint -> specialized invalid value generator
+        self._invalid_generators = {}
         
+        _import_dependencies()
         self._load_proto()
     
     def _load_proto(self):
         """Load and compile the proto file."""
         # Ensure validate.proto is compiled for Python so we can parse rules
         self._ensure_validate_pb2()
+        _ensure_validate_pb2_imported()
 
         # Get absolute path of proto file
         proto_abs_path = os.path.abspath(self.proto_file)
         proto_dir = os.path.dirname(proto_abs_path)
-        proto_basename = os.path.basename(proto_abs_path)
         
         # Add common paths
         search_paths = [
@@ -161,7 +669,102 @@ class DataGenerator:
             os.path.join(os.path.dirname(__file__), 'proto'),
         ] + [os.path.abspath(p) for p in self.include_paths]
         
-        # Create FileDescriptorSet
+        search_paths = [path for path in search_paths if os.path.exists(path)]
+
+        file_set = self._load_descriptor_set(proto_abs_path, search_paths)
+        
+        # Find our file descriptor
+        proto_name = os.path.basename(self.proto_file)
+        files_by_name = {fdesc.name: fdesc for fdesc in file_set.file}
+        self.file_descriptor = files_by_name.get(proto_name)
+        if self.file_descriptor is None:
+            suffix = '/' + proto_name
+            self.file_descriptor = next(
+                (fdesc for fdesc in file_set.file if fdesc.name.endswith(suffix)), None)
+        
+        if not self.file_descriptor:
+            raise ValueError(f"Could not find descriptor for {proto_name}")
+        
+        # Parse message descriptors
+        self._parse_messages()
+
+    def _load_descriptor_set(self, proto_abs_path, search_paths):
+        """Get the FileDescriptorSet for proto_abs_path, running protoc only if needed.
+
+        Parsed sets are memoized in-process by path and mtime. The serialized
+        output of protoc is also cached in a per-user directory, keyed by the
+        proto contents and the include paths, and reused as long as none of
+        the files it was built from is newer than the cache entry.
+        """
+        memo_key = (proto_abs_path, os.stat(proto_abs_path).st_mtime_ns, tuple(search_paths))
+        file_set = _DESCRIPTOR_SETS.get(memo_key)
+        if file_set is not None:
+            return file_set
+
+        with open(proto_abs_path, 'rb') as f:
+            proto_data = f.read()
+        key = hashlib.blake2b(
+            proto_data + b'\0' + '|'.join(search_paths).encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        cache_dir = _descriptor_cache_dir()
+        cache_path = os.path.join(cache_dir, key + '.pb') if cache_dir else None
+
+        file_set = None
+        if cache_path is not None:
+            file_set = self._read_cached_descriptor_set(cache_path, search_paths)
+        if file_set is None:
+            descriptor_data = self._run_protoc_descriptor_set(proto_abs_path, search_paths)
+            file_set = descriptor_pb2.FileDescriptorSet()
+            file_set.ParseFromString(descriptor_data)
+
+            if cache_path is not None:
+                try:
+                    tmp_path = cache_path + '.%d.tmp' % os.getpid()
+                    with open(tmp_path, 'wb') as f:
+                        f.write(descriptor_data)
+                    os.replace(tmp_path, cache_path)
+                except OSError:
+                    pass  # Caching is best-effort
+
+        _DESCRIPTOR_SETS[memo_key] = file_set
+        return file_set
+
+    @staticmethod
+    def _read_cached_descriptor_set(cache_path, search_paths):
+        """Load a cached FileDescriptorSet, or None if missing or out of date."""
+        try:
+            cache_mtime = os.stat(cache_path).st_mtime_ns
+            with open(cache_path, 'rb') as f:
+                descriptor_data = f.read()
+        except OSError:
+            return None
+
+        file_set = descriptor_pb2.FileDescriptorSet()
+        try:
+            file_set.ParseFromString(descriptor_data)
+        except Exception:
+            return None
+
+        # Imported files are not part of the key, so check their timestamps
+        for fdesc in file_set.file:
+            for path in search_paths:
+                try:
+                    if os.stat(os.path.join(path, fdesc.name)).st_mtime_ns > cache_mtime:
+                        return None
+                    break
+                except OSError:
+                    continue
+        return file_set
+
+    @staticmethod
+    def _run_protoc_descriptor_set(proto_abs_path, search_paths):
+        """Run protoc and return the serialized FileDescriptorSet.
+
+        All paths are absolute, so protoc is run without changing the
+        working directory of the process. The first search path is the
+        directory of the proto file, which protoc resolves it against.
+        """
         with TemporaryDirectory() as tmpdir:
             desc_file = os.path.join(tmpdir, 'descriptor.pb')
             
@@ -173,43 +776,18 @@ class DataGenerator:
             ]
             
             for path in search_paths:
-                if os.path.exists(path):
-                    protoc_args.append('-I' + path)
+                protoc_args.append('-I' + path)
             
-            # Use relative path from proto_dir
-            protoc_args.append(proto_basename)
+            protoc_args.append(proto_abs_path)
             
-            # Invoke protoc from the proto directory
-            old_cwd = os.getcwd()
-            try:
-                os.chdir(proto_dir)
-                status = invoke_protoc(protoc_args)
-            finally:
-                os.chdir(old_cwd)
+            status = invoke_protoc(protoc_args)
             
             if status != 0:
                 raise RuntimeError(f"protoc failed with status {status}")
             
             # Load descriptor
             with open(desc_file, 'rb') as f:
-                descriptor_data = f.read()
-        
-        # Parse FileDescriptorSet
-        file_set = descriptor_pb2.FileDescriptorSet()
-        file_set.ParseFromString(descriptor_data)
-        
-        # Find our file descriptor
-        proto_name = os.path.basename(self.proto_file)
-        for fdesc in file_set.file:
-            if fdesc.name == proto_name or fdesc.name.endswith('/' + proto_name):
-                self.file_descriptor = fdesc
-                break
-        
-        if not self.file_descriptor:
-            raise ValueError(f"Could not find descriptor for {proto_name}")
-        
-        # Parse message descriptors
-        self._parse_messages()
+                return f.read()
 
     def _ensure_validate_pb2(self) -> None:
         """Ensure generator/proto/validate_pb2.py exists by building it if missing.
@@ -217,15 +795,22 @@ class DataGenerator:
         This allows nanopb_validator to import validate_pb2 and parse
         (validate.rules) options from FieldOptions.
         """
+        global _validate_pb2_build_attempted
+        if _validate_pb2_build_attempted:
+            return
+        _validate_pb2_build_attempted = True
+
         try:
             # Resolve generator/proto directory and target file
             gen_dir = os.path.dirname(os.path.abspath(__file__))
             proto_dir = os.path.join(gen_dir, 'proto')
             target_py = os.path.join(proto_dir, 'validate_pb2.py')
 
-            # Fast path: already built
+            # Fast path: already built, or importable from elsewhere
             if os.path.isfile(target_py):
                 return
+            if importlib.util.find_spec('validate_pb2') is not None:
+                return
 
             # Build validate.proto into Python module in-place
             validate_proto = os.path.join(proto_dir, 'validate.proto')
@@ -236,16 +821,11 @@ class DataGenerator:
                 'protoc',
                 f'--python_out={proto_dir}',
                 f'-I{proto_dir}',
-                os.path.basename(validate_proto),
+                validate_proto,
             ]
 
-            old_cwd = os.getcwd()
-            try:
-                os.chdir(proto_dir)
-                # Use the same invoke_protoc helper used elsewhere to get builtin includes
-                invoke_protoc(protoc_args)
-            finally:
-                os.chdir(old_cwd)
+            # Use the same invoke_protoc helper used elsewhere to get builtin includes
+            invoke_protoc(protoc_args)
         except Exception:
             # Soft-fail: if building fails, rule parsing will be skipped
             pass
@@ -253,16 +833,17 @@ class DataGenerator:
     def _parse_messages(self):
         """Parse message descriptors from file descriptor."""
         for msg_desc in self.file_descriptor.message_type:
-            msg_name = msg_desc.name
-            fields = {}
-            
-            for field_desc in msg_desc.field:
-                fields[field_desc.name] = ProtoFieldInfo(field_desc)
+            field_infos = tuple(ProtoFieldInfo(field_desc) for field_desc in msg_desc.field)
+            constrained_infos = tuple(info for info in field_infos if info.constraints)
             
-            self.message_descriptors[msg_name] = {
-                'descriptor': msg_desc,
-                'fields': fields
-            }
+            self.message_descriptors[msg_desc.name] = MessageDesc(
+                descriptor=msg_desc,
+                field_names=tuple(info.name for info in field_infos),
+                field_infos=field_infos,
+                fields={info.name: info for info in field_infos},
+                constrained_infos=constrained_infos,
+                constrained_fields={info.name: info for info in constrained_infos},
+            )
     
     def get_messages(self) -> List[str]:
         """Get list of message names in the proto file."""
@@ -270,15 +851,24 @@ class DataGenerator:
     
     def get_field_info(self, message_name: str, field_name: str) -> Optional[ProtoFieldInfo]:
         """Get field information for a specific message field."""
-        if message_name not in self.message_descriptors:
+        msg_desc = self.message_descriptors.get(message_name)
+        if msg_desc is None:
             return None
-        return self.message_descriptors[message_name]['fields'].get(field_name)
+        return msg_desc.fields.get(field_name)
     
     def get_all_fields(self, message_name: str) -> Dict[str, ProtoFieldInfo]:
         """Get all fields for a message."""
-        if message_name not in self.message_descriptors:
+        msg_desc = self.message_descriptors.get(message_name)
+        if msg_desc is None:
             return {}
-        return self.message_descriptors[message_name]['fields']
+        return msg_desc.fields
+    
+    def _get_message_desc(self, message_name: str) -> MessageDesc:
+        """Look up a parsed message, raising ValueError if it does not exist."""
+        msg_desc = self.message_descriptors.get(message_name)
+        if msg_desc is None:
+            raise ValueError(f"Message {message_name} not found")
+        return msg_desc
     
     def generate_valid(self, message_name: str, seed: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -292,21 +882,57 @@ class DataGenerator:
             Dictionary of field values
         """
         if seed is not None:
-            random.seed(seed)
+            self._rng.seed(seed)
         
-        if message_name not in self.message_descriptors:
-            raise ValueError(f"Message {message_name} not found")
-        
-        fields = self.message_descriptors[message_name]['fields']
+        msg_desc = self._get_message_desc(message_name)
         data = {}
         
-        for field_name, field_info in fields.items():
+        for field_name, field_info in zip(msg_desc.field_names, msg_desc.field_infos):
             value = self._generate_valid_value(field_info)
             if value is not None:
                 data[field_name] = value
         
         return data
     
+    def generate_valid_batch(
+        self,
+        message_name: str,
+        count: int,
+        base_seed: int = 0,
+        workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate many valid messages, optionally in parallel processes.
+        
+        Item i is the same as generate_valid(message_name, seed=base_seed + i),
+        so the result does not depend on the number of workers.
+        
+        Args:
+            message_name: Name of the message type
+            count: Number of messages to generate
+            base_seed: Seed of the first message
+            workers: Number of worker processes; None or 1 generates in
+                this process. Each worker loads the proto file once.
+        
+        Returns:
+            List of dictionaries of field values
+        """
+        self._get_message_desc(message_name)
+        seeds = range(base_seed, base_seed + count)
+        if workers is None or workers <= 1 or count < 2:
+            return [self.generate_valid(message_name, seed=seed) for seed in seeds]
+        
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, count // (workers * 4))
+        jobs = [(message_name, seeds[i:i + chunksize]) for i in range(0, count, chunksize)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.proto_file, self.include_paths)) as executor:
+            for items in executor.map(_generate_valid_worker, jobs):
+                results.extend(items)
+        return results
+    
     def generate_invalid(
         self,
         message_name: str,
@@ -332,71 +958,119 @@ class DataGenerator:
             Dictionary of field values with one or more invalid values
         """
         if seed is not None:
-            random.seed(seed)
+            self._rng.seed(seed)
         
         # Start with valid data
         data = self.generate_valid(message_name, seed=None)  # Don't reuse seed
         
-        fields = self.message_descriptors[message_name]['fields']
+        msg_desc, selected_infos, candidate_rules = self._select_violations(
+            message_name, violate_field, violate_rule
+        )
+        if selected_infos is None:
+            # Default behavior: pick one random constrained field
+            selected_infos = (self._rng.choice(msg_desc.constrained_infos),)
 
-        # Collect all fields with constraints
-        constrained_fields = {
-            name: info for name, info in fields.items() if info.constraints
-        }
+        # For each selected field, choose a constraint and apply invalid value
+        for finfo in selected_infos:
+            self._apply_violation(data, finfo, candidate_rules)
+
+        return data
+    
+    def generate_invalid_batch(
+        self,
+        message_name: str,
+        count: int,
+        violate_field: Optional[Union[str, List[str]]] = None,
+        violate_rule: Optional[Union[str, List[str]]] = None,
+        seed: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate many invalid messages from a single valid base message.
+        
+        Arguments are as for generate_invalid(). The valid data is generated
+        once and the field and rule selection is resolved once; each item is
+        then a copy of the base data with the chosen violations applied.
+        
+        Args:
+            message_name: Name of the message type
+            count: Number of messages to generate
+            violate_field: Specific field(s) to make invalid
+            violate_rule: Specific rule(s) to violate
+            seed: Random seed for reproducibility
+        
+        Returns:
+            Iterator over dictionaries of field values
+        """
+        if seed is not None:
+            self._rng.seed(seed)
+        
+        base = self.generate_valid(message_name, seed=None)
+        msg_desc, selected_infos, candidate_rules = self._select_violations(
+            message_name, violate_field, violate_rule
+        )
+        return self._iter_invalid(base, count, msg_desc.constrained_infos, selected_infos, candidate_rules)
+
+    def _iter_invalid(self, base, count, constrained_infos, selected_infos, candidate_rules):
+        """Yield count copies of base, each with violations applied."""
+        choice = self._rng.choice
+        for _ in range(count):
+            data = base.copy()
+            for finfo in selected_infos if selected_infos is not None else (choice(constrained_infos),):
+                self._apply_violation(data, finfo, candidate_rules)
+            yield data
+
+    def _select_violations(self, message_name, violate_field, violate_rule):
+        """Resolve the violate_field/violate_rule arguments of generate_invalid().
+
+        Returns (msg_desc, selected_infos, candidate_rules), where
+        selected_infos is None if a random field should be chosen.
+        """
+        msg_desc = self._get_message_desc(message_name)
+        fields = msg_desc.fields
+        constrained_fields = msg_desc.constrained_fields
         if not constrained_fields:
             raise ValueError(f"No validation constraints found for {message_name}")
 
         # Normalize violate_field into a list of field names
-        if violate_field is None:
-            # Default behavior: pick one random constrained field
-            selected_fields = [random.choice(list(constrained_fields.keys()))]
-        elif isinstance(violate_field, str):
-            selected_fields = [f.strip() for f in violate_field.split(',') if f.strip()]
-        else:
-            selected_fields = []
-            for f in violate_field:
-                if isinstance(f, str):
-                    selected_fields.extend([p.strip() for p in f.split(',') if p.strip()])
-
-        # Validate fields exist and have constraints
-        for fname in selected_fields:
-            if fname not in constrained_fields:
-                if fname not in fields:
-                    raise ValueError(f"Field {fname} does not exist in message {message_name}")
-                else:
-                    raise ValueError(f"Field {fname} has no constraints to violate")
-
-        # Normalize violate_rule into a list of rule names (may be empty)
-        if violate_rule:
-            if isinstance(violate_rule, str):
-                candidate_rules = [r.strip() for r in violate_rule.split(',') if r.strip()]
-            else:
-                candidate_rules = []
-                for r in violate_rule:
-                    if isinstance(r, str):
-                        candidate_rules.extend([p.strip() for p in r.split(',') if p.strip()])
+        selected_infos = None
+        if violate_field is not None:
+            selected_fields = _normalize_csv_arg(violate_field)
+
+            # Validate fields exist and have constraints
+            for fname in selected_fields:
+                if fname not in constrained_fields:
+                    if fname not in fields:
+                        raise ValueError(f"Field {fname} does not exist in message {message_name}")
+                    else:
+                        raise ValueError(f"Field {fname} has no constraints to violate")
+            selected_infos = tuple(constrained_fields[fname] for fname in selected_fields)
+
+        # Normalize violate_rule into a set of rule names (may be empty)
+        candidate_rules = frozenset(_normalize_csv_arg(violate_rule) if violate_rule else ())
+        return msg_desc, selected_infos, candidate_rules
+
+    def _apply_violation(self, data, finfo, candidate_rules):
+        """Choose a constraint of finfo and store a value violating it in data."""
+        matching_rules = candidate_rules & finfo.constraint_rules_set
+        if matching_rules:
+            # Keep declaration order so that seeded runs are reproducible
+            matching_constraints = [c for c in finfo.constraints if c.rule_type in matching_rules]
+            chosen = self._rng.choice(matching_constraints)
         else:
-            candidate_rules = []
+            # No rule requested, or none matching: choose any constraint
+            chosen = self._rng.choice(finfo.constraints)
 
-        # For each selected field, choose a constraint and apply invalid value
-        for fname in selected_fields:
-            finfo = constrained_fields[fname]
-
-            if candidate_rules:
-                matching_constraints = [c for c in finfo.constraints if c.rule_type in set(candidate_rules)]
-                if matching_constraints:
-                    chosen = random.choice(matching_constraints)
-                else:
-                    # Fallback: choose any available constraint for this field
-                    chosen = random.choice(finfo.constraints)
+        invalid_value = self._generate_invalid_value(finfo, chosen)
+        if finfo.is_repeated() and chosen.rule_type not in ('min_items', 'max_items', 'unique'):
+            # Item rule: put the invalid value into an otherwise valid list
+            items = list(data.get(finfo.name) or [])
+            if items:
+                items[self._rng.randrange(len(items))] = invalid_value
             else:
-                chosen = random.choice(finfo.constraints)
-
-            invalid_value = self._generate_invalid_value(finfo, chosen)
-            data[fname] = invalid_value
+                items.append(invalid_value)
+            invalid_value = items
+        data[finfo.name] = invalid_value
 
-        return data
-    
     def _generate_valid_value(self, field_info: ProtoFieldInfo) -> Any:
         """Generate a valid value for a field."""
         type_name = field_info.get_type_name()
@@ -405,259 +1079,149 @@ class DataGenerator:
             return self._generate_valid_repeated(field_info)
         
         # Find constraints
-        constraints = {c.rule_type: c.value for c in field_info.constraints}
+        constraints = field_info.constraints_dict
         
         # Generate based on type
-        if type_name == 'int32':
-            return self._generate_valid_int32(constraints)
-        elif type_name == 'int64':
-            return self._generate_valid_int64(constraints)
-        elif type_name == 'uint32':
-            return self._generate_valid_uint32(constraints)
-        elif type_name == 'uint64':
-            return self._generate_valid_uint64(constraints)
-        elif type_name == 'sint32':
-            return self._generate_valid_int32(constraints)
-        elif type_name == 'sint64':
-            return self._generate_valid_int64(constraints)
-        elif type_name == 'float':
-            return self._generate_valid_float(constraints)
-        elif type_name == 'double':
-            return self._generate_valid_double(constraints)
-        elif type_name == 'bool':
-            return self._generate_valid_bool(constraints)
-        elif type_name == 'string':
-            return self._generate_valid_string(constraints)
-        elif type_name == 'bytes':
-            return self._generate_valid_bytes(constraints)
-        else:
+        generate = self._valid_dispatch.get(type_name)
+        if generate is None:
             # Default values for unsupported types
             return None
+        return generate(constraints)
     
     def _generate_valid_int32(self, constraints: Dict[str, Any]) -> int:
         """Generate valid int32 value."""
-        min_val = -(2**31)
-        max_val = 2**31 - 1
-        
-        if 'gte' in constraints:
-            min_val = max(min_val, int(constraints['gte']))
-        elif 'gt' in constraints:
-            min_val = max(min_val, int(constraints['gt']) + 1)
-        
-        if 'lte' in constraints:
-            max_val = min(max_val, int(constraints['lte']))
-        elif 'lt' in constraints:
-            max_val = min(max_val, int(constraints['lt']) - 1)
-        
-        if 'const' in constraints:
-            return int(constraints['const'])
-        
-        if 'in' in constraints:
-            return random.choice(constraints['in'])
-        
-        return random.randint(min_val, max_val)
+        return _random_ints(self._rng, constraints, *_INT_LIMITS['int32'][:2], 1)[0]
     
     def _generate_valid_int64(self, constraints: Dict[str, Any]) -> int:
         """Generate valid int64 value."""
-        min_val = -(2**63)
-        max_val = 2**63 - 1
-        
-        if 'gte' in constraints:
-            min_val = max(min_val, int(constraints['gte']))
-        elif 'gt' in constraints:
-            min_val = max(min_val, int(constraints['gt']) + 1)
-        
-        if 'lte' in constraints:
-            max_val = min(max_val, int(constraints['lte']))
-        elif 'lt' in constraints:
-            max_val = min(max_val, int(constraints['lt']) - 1)
-        
-        if 'const' in constraints:
-            return int(constraints['const'])
-        
-        # For large ranges, generate reasonable values
-        if max_val - min_val > 10**9:
-            return random.randint(min_val, min(min_val + 10**9, max_val))
-        
-        return random.randint(min_val, max_val)
+        min_val, max_val, max_span = _INT_LIMITS['int64']
+        return _random_ints(self._rng, constraints, min_val, max_val, 1, max_span)[0]
     
     def _generate_valid_uint32(self, constraints: Dict[str, Any]) -> int:
         """Generate valid uint32 value."""
-        min_val = 0
-        max_val = 2**32 - 1
-        
-        if 'gte' in constraints:
-            min_val = max(min_val, int(constraints['gte']))
-        elif 'gt' in constraints:
-            min_val = max(min_val, int(constraints['gt']) + 1)
-        
-        if 'lte' in constraints:
-            max_val = min(max_val, int(constraints['lte']))
-        elif 'lt' in constraints:
-            max_val = min(max_val, int(constraints['lt']) - 1)
-        
-        if 'const' in constraints:
-            return int(constraints['const'])
-        
-        return random.randint(min_val, max_val)
+        return _random_ints(self._rng, constraints, *_INT_LIMITS['uint32'][:2], 1)[0]
     
     def _generate_valid_uint64(self, constraints: Dict[str, Any]) -> int:
         """Generate valid uint64 value."""
-        min_val = 0
-        max_val = 2**64 - 1
-        
-        if 'gte' in constraints:
-            min_val = max(min_val, int(constraints['gte']))
-        elif 'gt' in constraints:
-            min_val = max(min_val, int(constraints['gt']) + 1)
-        
-        if 'lte' in constraints:
-            max_val = min(max_val, int(constraints['lte']))
-        elif 'lt' in constraints:
-            max_val = min(max_val, int(constraints['lt']) - 1)
-        
-        if 'const' in constraints:
-            return int(constraints['const'])
-        
-        # For large ranges, generate reasonable values
-        if max_val - min_val > 10**9:
-            return random.randint(min_val, min(min_val + 10**9, max_val))
-        
-        return random.randint(min_val, max_val)
+        min_val, max_val, max_span = _INT_LIMITS['uint64']
+        return _random_ints(self._rng, constraints, min_val, max_val, 1, max_span)[0]
     
     def _generate_valid_float(self, constraints: Dict[str, Any]) -> float:
         """Generate valid float value."""
-        min_val = -3.4e38
-        max_val = 3.4e38
-        
-        if 'gte' in constraints:
-            min_val = max(min_val, float(constraints['gte']))
-        elif 'gt' in constraints:
-            min_val = max(min_val, float(constraints['gt']) + 0.01)
-        
-        if 'lte' in constraints:
-            max_val = min(max_val, float(constraints['lte']))
-        elif 'lt' in constraints:
-            max_val = min(max_val, float(constraints['lt']) - 0.01)
-        
-        if 'const' in constraints:
-            return float(constraints['const'])
-        
-        return random.uniform(min_val, max_val)
+        return _random_floats(self._rng, constraints, *_FLOAT_LIMITS['float'], 1)[0]
     
     def _generate_valid_double(self, constraints: Dict[str, Any]) -> float:
         """Generate valid double value."""
-        min_val = -1.7e308
-        max_val = 1.7e308
-        
-        if 'gte' in constraints:
-            min_val = max(min_val, float(constraints['gte']))
-        elif 'gt' in constraints:
-            min_val = max(min_val, float(constraints['gt']) + 0.01)
-        
-        if 'lte' in constraints:
-            max_val = min(max_val, float(constraints['lte']))
-        elif 'lt' in constraints:
-            max_val = min(max_val, float(constraints['lt']) - 0.01)
-        
-        if 'const' in constraints:
-            return float(constraints['const'])
-        
-        return random.uniform(min_val, max_val)
+        return _random_floats(self._rng, constraints, *_FLOAT_LIMITS['double'], 1)[0]
     
     def _generate_valid_bool(self, constraints: Dict[str, Any]) -> bool:
         """Generate valid bool value."""
         if 'const' in constraints:
             return bool(constraints['const'])
-        return random.choice([True, False])
+        return self._rng.choice([True, False])
     
     def _generate_valid_string(self, constraints: Dict[str, Any]) -> str:
         """Generate valid string value."""
-        min_len = constraints.get('min_len', 1)
-        max_len = constraints.get('max_len', 20)
+        # The constraint set of a field never changes, so the generator
+        # specialized for it is built once and reused on later calls.
+        key = tuple(constraints.items())
+        generate = self._string_generators.get(key)
+        if generate is None:
+            generate = self._compile_string_generator(constraints)
+            self._string_generators[key] = generate
+        return generate()
+
+    def _compile_string_generator(self, constraints: Dict[str, Any]) -> Callable[[], str]:
+        """Build a string generator specialized for one set of constraints."""
+        rng = self._rng
 
         # Constants and enumerations take precedence
         if 'const' in constraints:
-            return constraints['const']
+            const = constraints['const']
+            return lambda: const
 
         if 'in' in constraints:
-            return random.choice(constraints['in'])
+            values = constraints['in']
+            return lambda: rng.choice(values)
 
-        # Specialized string constraints (PGV-style)
-        # When these are present, prefer generating a compliant value directly
-        try:
-            if constraints.get('email'):
-                return self._generate_valid_email()
-            if constraints.get('hostname'):
-                return self._generate_valid_hostname()
-            if constraints.get('ipv4'):
-                return self._generate_valid_ipv4()
-            if constraints.get('ipv6'):
-                return self._generate_valid_ipv6()
-            if constraints.get('ip'):
-                # Randomly choose either IPv4 or IPv6
-                return self._generate_valid_ipv4() if random.choice([True, False]) else self._generate_valid_ipv6()
-        except Exception:
-            # Fallback to generic generation if specialized fails for any reason
-            pass
+        # Generic string generation path: the result is laid out as
+        # prefix + body (with 'contains' inserted) + suffix, with the body
+        # length chosen so that the total meets min_len/max_len.
+        # Check for ASCII constraint
+        chars = _CHARS_ASCII_ALNUM if constraints.get('ascii', False) else _CHARS_ASCII_ALL
 
-        # Generic string generation path
-        length = max(min_len, min(max_len, random.randint(min_len, max_len)))
+        prefix = constraints.get('prefix', '')
+        suffix = constraints.get('suffix', '')
+        contains = constraints.get('contains', '')
+        if contains in prefix or contains in suffix:
+            contains = ''
 
-        # Check for ASCII constraint
-        if constraints.get('ascii', False):
-            chars = string.ascii_letters + string.digits
+        fixed_len = len(prefix) + len(contains) + len(suffix)
+        body_min = max(0, constraints.get('min_len', 1) - fixed_len)
+        body_max = max(body_min, constraints.get('max_len', 20) - fixed_len)
+        forbidden = constraints.get('not_in', ())
+
+        # If prefix, contains and suffix do not fit into max_len together,
+        # the body is empty and the result is truncated to max_len.
+        max_len = constraints.get('max_len')
+        if max_len is None or fixed_len <= max_len:
+            max_len = None
+
+        def generic():
+            length = rng.randint(body_min, body_max)
+            body = ''.join(rng.choices(chars, k=length))
+            pos = rng.randint(0, length) if contains else 0
+            base_str = (prefix + body[:pos] + contains + body[pos:] + suffix)[:max_len]
+            if base_str not in forbidden:
+                return base_str
+
+            # Check not_in constraint. On a collision, vary the first random
+            # character instead of generating the whole string again. An
+            # empty body has nothing to vary, so draw a non-empty one.
+            if not length and body_max > 0:
+                length = rng.randint(max(1, body_min), body_max)
+                body = ''.join(rng.choices(chars, k=length))
+                pos = rng.randint(0, length) if contains else 0
+            if length:
+                for c in chars:
+                    body = c + body[1:]
+                    candidate = prefix + body[:pos] + contains + body[pos:] + suffix
+                    if candidate not in forbidden:
+                        return candidate
+            raise ValueError(f"Cannot generate a string that is not in {sorted(forbidden)}")
+
+        # Specialized string constraints (PGV-style)
+        # When these are present, prefer generating a compliant value directly
+        if constraints.get('email'):
+            special = self._generate_valid_email
+        elif constraints.get('hostname'):
+            special = self._generate_valid_hostname
+        elif constraints.get('ipv4'):
+            special = self._generate_valid_ipv4
+        elif constraints.get('ipv6'):
+            special = self._generate_valid_ipv6
+        elif constraints.get('ip'):
+            # Randomly choose either IPv4 or IPv6
+            ipv4 = self._generate_valid_ipv4
+            ipv6 = self._generate_valid_ipv6
+            special = lambda: ipv4() if rng.choice([True, False]) else ipv6()
         else:
-            chars = string.ascii_letters + string.digits + string.punctuation
-
-        base_str = ''.join(random.choice(chars) for _ in range(max(1, length)))
-
-        # Apply prefix
-        if 'prefix' in constraints:
-            prefix = constraints['prefix']
-            remaining = max(0, max_len - len(prefix))
-            base_str = (prefix + base_str[:remaining]) if remaining > 0 else prefix
-
-        # Apply suffix
-        if 'suffix' in constraints:
-            suffix = constraints['suffix']
-            available = max(0, max_len - len(suffix))
-            base_str = (base_str[:available] + suffix) if available > 0 else suffix
-
-        # Apply contains
-        if 'contains' in constraints:
-            contains = constraints['contains']
-            if contains not in base_str:
-                if len(base_str) + len(contains) <= max_len:
-                    pos = random.randint(0, len(base_str))
-                    base_str = base_str[:pos] + contains + base_str[pos:]
-                else:
-                    pos = random.randint(0, max(0, len(base_str) - len(contains)))
-                    base_str = base_str[:pos] + contains + base_str[pos + len(contains):]
-
-        # Check not_in constraint
-        if 'not_in' in constraints:
-            forbidden = set(constraints['not_in']) if isinstance(constraints['not_in'], list) else {constraints['not_in']}
-            attempts = 0
-            while base_str in forbidden and attempts < 10:
-                base_str = ''.join(random.choice(chars) for _ in range(max(1, length)))
-                attempts += 1
-
-        # Ensure length constraints
-        if len(base_str) < min_len:
-            base_str += ''.join(random.choice(chars) for _ in range(min_len - len(base_str)))
-        if len(base_str) > max_len:
-            base_str = base_str[:max_len]
-
-        return base_str
+            return generic
+
+        def specialized():
+            try:
+                return special()
+            except Exception:
+                # Fallback to generic generation if specialized fails for any reason
+                return generic()
+        return specialized
 
     # ----- Specialized string generators -----
     def _generate_valid_email(self) -> str:
         """Generate a simple valid email address."""
         # Local part: letters/digits/dot/underscore/hyphen, not starting/ending with dot
-        lp_len = random.randint(1, 16)
-        lp_chars = string.ascii_letters + string.digits + '._-'
-        local = ''.join(random.choice(lp_chars) for _ in range(lp_len))
+        lp_len = self._rng.randint(1, 16)
+        local = ''.join(self._rng.choices(_CHARS_EMAIL_LOCAL, k=lp_len))
         local = local.strip('.')
         if not local:
             local = 'u'
@@ -668,11 +1232,10 @@ class DataGenerator:
         """Generate a valid hostname (RFC 1123-ish)."""
         # 1-3 labels, each 1-63 chars, a-z0-9-, no leading/trailing hyphen
         labels = []
-        num_labels = random.randint(2, 4)
+        num_labels = self._rng.randint(2, 4)
         for _ in range(num_labels):
-            length = random.randint(1, min(12, 63))
-            chars = string.ascii_lowercase + string.digits + '-'
-            label = ''.join(random.choice(chars) for _ in range(length))
+            length = self._rng.randint(1, min(12, 63))
+            label = ''.join(self._rng.choices(_CHARS_HOSTNAME_LABEL, k=length))
             # Fix leading/trailing hyphen
             if label[0] == '-':
                 label = 'a' + label[1:]
@@ -685,85 +1248,73 @@ class DataGenerator:
 
     def _generate_valid_ipv4(self) -> str:
         """Generate a valid IPv4 address in dotted-decimal form."""
-        return '.'.join(str(random.randint(0, 255)) for _ in range(4))
+        value = self._rng.getrandbits(32)
+        return f"{value >> 24}.{(value >> 16) & 0xff}.{(value >> 8) & 0xff}.{value & 0xff}"
 
     def _generate_valid_ipv6(self) -> str:
         """Generate a simple valid IPv6 address (no compression)."""
-        hextet = lambda: ''.join(random.choice('0123456789abcdef') for _ in range(random.randint(1, 4)))
-        return ':'.join(hextet() for _ in range(8))
+        # One 128-bit draw, formatted as eight 16-bit hextets
+        value = self._rng.getrandbits(128)
+        return ':'.join('%x' % ((value >> shift) & 0xffff) for shift in range(112, -16, -16))
     
     def _generate_valid_bytes(self, constraints: Dict[str, Any]) -> bytes:
         """Generate valid bytes value."""
-        min_len = constraints.get('min_len', 1)
-        max_len = constraints.get('max_len', 20)
-        
         if 'const' in constraints:
             return constraints['const']
         
-        length = random.randint(min_len, max_len)
-        return bytes(random.randint(0, 255) for _ in range(length))
+        min_len = constraints.get('min_len', 1)
+        max_len = constraints.get('max_len', 20)
+        
+        # Fixed-width fields need no length draw
+        length = min_len if min_len == max_len else self._rng.randint(min_len, max_len)
+        if length <= 0:
+            return b''
+        # Draw all the bytes at once; getrandbits() follows the seed, unlike os.urandom()
+        return self._rng.getrandbits(8 * length).to_bytes(length, 'little')
     
     def _generate_valid_repeated(self, field_info: ProtoFieldInfo) -> List[Any]:
         """Generate valid repeated field value."""
-        constraints = {c.rule_type: c.value for c in field_info.constraints}
+        constraints = field_info.constraints_dict
         
         min_items = constraints.get('min_items', 1)
         max_items = constraints.get('max_items', 5)
         
-        count = random.randint(min_items, max_items)
+        count = self._rng.randint(min_items, max_items)
         
         # Generate items based on the field's scalar type
         # We need to treat this as a non-repeated field for generation
         type_name = field_info.get_type_name()
-        item_constraints = {
-            c.rule_type: c.value for c in field_info.constraints
-            if c.rule_type not in ('min_items', 'max_items', 'unique')
-        }
-        
-        items = []
-        for _ in range(count):
-            # Generate single item based on type
-            if type_name == 'int32':
-                items.append(self._generate_valid_int32(item_constraints))
-            elif type_name == 'int64':
-                items.append(self._generate_valid_int64(item_constraints))
-            elif type_name == 'uint32':
-                items.append(self._generate_valid_uint32(item_constraints))
-            elif type_name == 'uint64':
-                items.append(self._generate_valid_uint64(item_constraints))
-            elif type_name == 'sint32':
-                items.append(self._generate_valid_int32(item_constraints))
-            elif type_name == 'sint64':
-                items.append(self._generate_valid_int64(item_constraints))
-            elif type_name == 'float':
-                items.append(self._generate_valid_float(item_constraints))
-            elif type_name == 'double':
-                items.append(self._generate_valid_double(item_constraints))
-            elif type_name == 'bool':
-                items.append(self._generate_valid_bool(item_constraints))
-            elif type_name == 'string':
-                items.append(self._generate_valid_string(item_constraints))
-            elif type_name == 'bytes':
-                items.append(self._generate_valid_bytes(item_constraints))
-            else:
-                items.append(None)
+        item_constraints = field_info.item_constraints_dict
+        generate = self._valid_dispatch.get(type_name)
+        
+        if type_name in _INT_LIMITS:
+            min_val, max_val, max_span = _INT_LIMITS[type_name]
+            items = _random_ints(self._rng, item_constraints, min_val, max_val, count, max_span)
+        elif type_name in _FLOAT_LIMITS:
+            min_val, max_val = _FLOAT_LIMITS[type_name]
+            items = _random_floats(self._rng, item_constraints, min_val, max_val, count)
+        elif generate is None:
+            items = [None] * count
+        else:
+            items = [generate(item_constraints) for _ in range(count)]
         
         # Handle unique constraint
         if constraints.get('unique', False):
-            items = list(set(items))
-            # Generate more items if needed
-            while len(items) < min_items:
-                if type_name == 'int32':
-                    items.append(self._generate_valid_int32(item_constraints))
-                elif type_name == 'int64':
-                    items.append(self._generate_valid_int64(item_constraints))
-                elif type_name == 'uint32':
-                    items.append(self._generate_valid_uint32(item_constraints))
-                elif type_name == 'uint64':
-                    items.append(self._generate_valid_uint64(item_constraints))
-                elif type_name == 'string':
+            # Drop duplicates, keeping the first occurrence of each item
+            items = list(dict.fromkeys(items))
+            # Generate more items if needed, with a bounded number of attempts
+            # in case the constraints allow only a few distinct values
+            seen = set(items)
+            attempts = min_items * 4
+            while len(items) < min_items and attempts > 0 and generate is not None:
+                attempts -= 1
+                item = generate(item_constraints)
+                if item in seen and type_name == 'string':
                     # For strings, append a unique suffix
-                    items.append(self._generate_valid_string(item_constraints) + f"_{len(items)}")
+                    item += f"_{len(items)}"
+                if item not in seen:
+                    seen.add(item)
+                    items.append(item)
         
         return items
     
@@ -773,140 +1324,103 @@ class DataGenerator:
         constraint: ValidationConstraint
     ) -> Any:
         """Generate an invalid value that violates the given constraint."""
+        # Constraints live as long as the parsed messages of this generator,
+        # so their id() identifies them for the lifetime of the cache.
+        generate = self._invalid_generators.get(id(constraint))
+        if generate is None:
+            generate = self._compile_invalid_generator(field_info, constraint)
+            self._invalid_generators[id(constraint)] = generate
+        return generate()
+
+    def _compile_invalid_generator(
+        self,
+        field_info: ProtoFieldInfo,
+        constraint: ValidationConstraint
+    ) -> Callable[[], Any]:
+        """Build an invalid value generator specialized for one constraint."""
         rule_type = constraint.rule_type
         rule_value = constraint.value
-        type_name = field_info.get_type_name()
-        
-        # Handle different constraint types
-        if rule_type in ('gt', 'gte'):
-            # Violate by going below threshold
-            if rule_type == 'gt':
-                return rule_value - (random.randint(1, 100) if type_name.startswith('int') else random.uniform(0.1, 10))
-            else:  # gte
-                return rule_value - (random.randint(1, 100) if type_name.startswith('int') else random.uniform(0.1, 10))
-        
-        elif rule_type in ('lt', 'lte'):
-            # Violate by going above threshold
-            if rule_type == 'lt':
-                return rule_value + (random.randint(1, 100) if type_name.startswith('int') else random.uniform(0.1, 10))
-            else:  # lte
-                return rule_value + (random.randint(1, 100) if type_name.startswith('int') else random.uniform(0.1, 10))
-        
-        elif rule_type == 'const':
-            # Violate by using different value
-            if type_name in ('int32', 'int64', 'uint32', 'uint64', 'sint32', 'sint64'):
-                return rule_value + random.randint(1, 100)
-            elif type_name in ('float', 'double'):
-                return rule_value + random.uniform(1.0, 10.0)
-            elif type_name == 'bool':
-                return not rule_value
-            elif type_name == 'string':
-                return rule_value + "_invalid"
-            else:
-                return None
-        
-        elif rule_type == 'min_len':
-            # String/bytes too short
-            return 'x' * (rule_value - 1) if rule_value > 0 else ''
-        
-        elif rule_type == 'max_len':
-            # String/bytes too long
-            return 'x' * (rule_value + 10)
-        
-        elif rule_type == 'prefix':
-            # String without required prefix
-            return 'WRONG_' + rule_value
-        
-        elif rule_type == 'suffix':
-            # String without required suffix
-            return rule_value + '_WRONG'
-        
-        elif rule_type == 'contains':
-            # String without required substring
-            return 'DOES_NOT_CONTAIN_REQUIRED'
-        
-        elif rule_type == 'ascii':
-            # Non-ASCII string
-            return 'test_中文_invalid'
-        
-        elif rule_type == 'email':
-            # Not a valid email
-            return 'invalid-email-without-at'
-        
-        elif rule_type == 'hostname':
-            # Invalid hostname (illegal chars / formatting)
-            return '-bad_host_name-'
-        
-        elif rule_type == 'ip':
-            # Not an IP format
-            return '999.999.999.999'
-        
-        elif rule_type == 'ipv4':
-            # Invalid IPv4
-            return '256.300.1.2'
-        
-        elif rule_type == 'ipv6':
-            # Invalid IPv6 (non-hex)
-            return 'gggg:gggg:gggg:gggg:gggg:gggg:gggg:gggg'
-        
-        elif rule_type == 'in':
-            # Value not in allowed list
-            if type_name == 'string':
-                return 'not_in_list_' + str(random.randint(1, 1000))
-            else:
-                return 999999
-        
-        elif rule_type == 'not_in':
-            # Value in forbidden list
-            if isinstance(rule_value, list) and rule_value:
-                return rule_value[0]
-            return rule_value
-        
-        elif rule_type == 'min_items':
-            # Too few items
-            return [] if rule_value > 0 else []
-        
-        elif rule_type == 'max_items':
-            # Too many items - generate items based on type
-            items = []
-            type_name = field_info.get_type_name()
-            item_constraints = {
-                c.rule_type: c.value for c in field_info.constraints
-                if c.rule_type not in ('min_items', 'max_items', 'unique')
-            }
-            
-            for _ in range(rule_value + 5):
-                if type_name == 'int32':
-                    items.append(self._generate_valid_int32(item_constraints))
-                elif type_name == 'int64':
-                    items.append(self._generate_valid_int64(item_constraints))
-                elif type_name == 'uint32':
-                    items.append(self._generate_valid_uint32(item_constraints))
-                elif type_name == 'string':
-                    items.append(self._generate_valid_string(item_constraints))
-                else:
-                    items.append(0)
-            return items
-        
-        elif rule_type == 'unique':
-            # Duplicate items
-            type_name = field_info.get_type_name()
-            item_constraints = {
-                c.rule_type: c.value for c in field_info.constraints
-                if c.rule_type not in ('min_items', 'max_items', 'unique')
-            }
-            
-            if type_name == 'int32':
-                item = self._generate_valid_int32(item_constraints)
-            elif type_name == 'string':
-                item = self._generate_valid_string(item_constraints)
+        if rule_type in _INVALID_STRINGS:
+            invalid_string = _INVALID_STRINGS[rule_type]
+            return lambda: invalid_string
+
+        if rule_type in ('gt', 'gte', 'lt', 'lte'):
+            # Step past the bound by an offset drawn for the numeric type
+            if field_info.get_type_name() in _INT_LIMITS:
+                offset, low, high = self._rng.randint, 1, 100
             else:
-                item = 42
-            
-            return [item, item, item]
-        
-        # Default: return a clearly invalid value
+                offset, low, high = self._rng.uniform, 0.1, 10
+            if rule_type in ('gt', 'gte'):
+                return lambda: rule_value - offset(low, high)
+            return lambda: rule_value + offset(low, high)
+
+        generate = self._invalid_dispatch.get(rule_type)
+        if generate is None:
+            # Default: return a clearly invalid value
+            return lambda: None
+        return functools.partial(generate, field_info, rule_value)
+
+    # ----- Invalid value generators -----
+    def _generate_invalid_const(self, field_info: ProtoFieldInfo, rule_value: Any) -> Any:
+        """Violate const by using a different value."""
+        type_name = field_info.get_type_name()
+        if type_name in _INT_LIMITS:
+            return rule_value + self._rng.randint(1, 100)
+        elif type_name in _FLOAT_LIMITS:
+            return rule_value + self._rng.uniform(1.0, 10.0)
+        elif type_name == 'bool':
+            return not rule_value
+        elif type_name == 'string':
+            return rule_value + "_invalid"
         return None
+
+    def _generate_invalid_min_len(self, field_info: ProtoFieldInfo, rule_value: Any) -> Any:
+        """String/bytes too short."""
+        filler = b'x' if field_info.get_type_name() == 'bytes' else 'x'
+        return filler * (rule_value - 1) if rule_value > 0 else filler[:0]
+
+    def _generate_invalid_max_len(self, field_info: ProtoFieldInfo, rule_value: Any) -> Any:
+        """String/bytes too long."""
+        filler = b'x' if field_info.get_type_name() == 'bytes' else 'x'
+        return filler * (rule_value + 10)
+
+    def _generate_invalid_prefix(self, field_info: ProtoFieldInfo, rule_value: Any) -> str:
+        """String without required prefix."""
+        return 'WRONG_' + rule_value
+
+    def _generate_invalid_suffix(self, field_info: ProtoFieldInfo, rule_value: Any) -> str:
+        """String without required suffix."""
+        return rule_value + '_WRONG'
+
+    def _generate_invalid_in(self, field_info: ProtoFieldInfo, rule_value: Any) -> Any:
+        """Value not in allowed list."""
+        if field_info.get_type_name() == 'string':
+            return 'not_in_list_' + str(self._rng.randint(1, 1000))
+        return 999999
+
+    def _generate_invalid_not_in(self, field_info: ProtoFieldInfo, rule_value: Any) -> Any:
+        """Value in forbidden list."""
+        if isinstance(rule_value, (list, tuple)) and rule_value:
+            return rule_value[0]
+        return rule_value
+
+    def _generate_invalid_min_items(self, field_info: ProtoFieldInfo, rule_value: Any) -> List[Any]:
+        """Too few items."""
+        return []
+
+    def _generate_invalid_max_items(self, field_info: ProtoFieldInfo, rule_value: Any) -> List[Any]:
+        """Too many items, generated based on the item type."""
+        generate = self._valid_dispatch.get(field_info.get_type_name())
+        if generate is None:
+            return [0] * (rule_value + 5)
+        item_constraints = field_info.item_constraints_dict
+        return [generate(item_constraints) for _ in range(rule_value + 5)]
+
+    def _generate_invalid_unique(self, field_info: ProtoFieldInfo, rule_value: Any) -> List[Any]:
+        """Duplicate items."""
+        generate = self._valid_dispatch.get(field_info.get_type_name())
+        item = 42 if generate is None else generate(field_info.item_constraints_dict)
+        return [item, item, item]
     
     def encode_to_binary(self, message_name: str, data: Dict[str, Any]) -> bytes:
         """
@@ -920,127 +1434,90 @@ class DataGenerator:
             Binary protobuf data
         """
         output = bytearray()
-        
-        if message_name not in self.message_descriptors:
-            raise ValueError(f"Message {message_name} not found")
-        
-        fields = self.message_descriptors[message_name]['fields']
+        fields = self._get_message_desc(message_name).fields
         
         # Encode each field
         for field_name, value in data.items():
-            if field_name not in fields:
+            field_info = fields.get(field_name)
+            if field_info is None:
                 continue
             
-            field_info = fields[field_name]
-            field_bytes = self._encode_field(field_info, value)
-            output.extend(field_bytes)
+            self._encode_field(output, field_info, value)
         
         return bytes(output)
     
-    def _encode_field(self, field_info: ProtoFieldInfo, value: Any) -> bytes:
-        """Encode a single field to protobuf wire format."""
-        field_number = field_info.number
-        field_type = field_info.type
-        
-        if field_info.is_repeated():
-            result = bytearray()
-            for item in value:
-                result.extend(self._encode_single_field(field_number, field_type, item))
-            return bytes(result)
-        else:
-            return self._encode_single_field(field_number, field_type, value)
-    
-    def _encode_single_field(self, field_number: int, field_type: int, value: Any) -> bytes:
-        """Encode a single field value to protobuf wire format."""
-        # Wire types: 0=varint, 1=64bit, 2=length-delimited, 5=32bit
-        
-        if field_type in (1, 2):  # double, float
-            wire_type = 1 if field_type == 1 else 5
-            key = (field_number << 3) | wire_type
-            key_bytes = self._encode_varint(key)
-            
-            if field_type == 1:  # double
-                value_bytes = struct.pack('<d', value)
-            else:  # float
-                value_bytes = struct.pack('<f', value)
-            
-            return key_bytes + value_bytes
-        
-        elif field_type in (3, 4, 5, 13):  # int64, uint64, int32, uint32
-            wire_type = 0
-            key = (field_number << 3) | wire_type
-            return self._encode_varint(key) + self._encode_varint(value)
+    def encode_and_format(
+        self,
+        message_name: str,
+        data: Dict[str, Any],
+        format_type: OutputFormat = OutputFormat.C_ARRAY,
+        name: str = "test_data",
+        out: Optional[IO] = None
+    ) -> Optional[Union[str, bytes]]:
+        """
+        Encode data and format it, like format_output(encode_to_binary(...)).
         
-        elif field_type in (17, 18):  # sint32, sint64
-            wire_type = 0
-            key = (field_number << 3) | wire_type
-            # ZigZag encoding
-            if field_type == 17:
-                encoded = (value << 1) ^ (value >> 31)
-            else:
-                encoded = (value << 1) ^ (value >> 63)
-            return self._encode_varint(key) + self._encode_varint(encoded)
+        If out is given, the encoded data is formatted and written to it
+        chunk by chunk as the fields are encoded, so that neither the whole
+        binary message nor the whole formatted text is held in memory.
         
-        elif field_type == 8:  # bool
-            wire_type = 0
-            key = (field_number << 3) | wire_type
-            return self._encode_varint(key) + self._encode_varint(1 if value else 0)
+        Args:
+            message_name: Name of the message type
+            data: Dictionary of field values
+            format_type: Desired output format
+            name: Variable name for C arrays
+            out: Optional file to write the output to
         
-        elif field_type in (9, 12):  # string, bytes
-            wire_type = 2
-            key = (field_number << 3) | wire_type
-            
-            if field_type == 9:  # string
-                value_bytes = value.encode('utf-8')
-            else:  # bytes
-                value_bytes = value
-            
-            return (self._encode_varint(key) +
-                    self._encode_varint(len(value_bytes)) +
-                    value_bytes)
+        Returns:
+            Formatted string, or None if out was given
+        """
+        if out is None or format_type == OutputFormat.PYTHON_DICT:
+            return self.format_output(self.encode_to_binary(message_name, data),
+                                      format_type, name, out)
         
-        elif field_type in (7, 15):  # fixed32, sfixed32
-            wire_type = 5
-            key = (field_number << 3) | wire_type
-            
-            if field_type == 7:  # fixed32
-                value_bytes = struct.pack('<I', value)
-            else:  # sfixed32
-                value_bytes = struct.pack('<i', value)
-            
-            return self._encode_varint(key) + value_bytes
+        self._write_output(out, self._encode_chunks(message_name, data), format_type, name)
+        return None
+    
+    def _encode_chunks(self, message_name: str, data: Dict[str, Any]) -> Iterator[bytearray]:
+        """Encode data field by field, yielding pieces of at least _OUTPUT_CHUNK bytes."""
+        fields = self._get_message_desc(message_name).fields
         
-        elif field_type in (6, 16):  # fixed64, sfixed64
-            wire_type = 1
-            key = (field_number << 3) | wire_type
-            
-            if field_type == 6:  # fixed64
-                value_bytes = struct.pack('<Q', value)
-            else:  # sfixed64
-                value_bytes = struct.pack('<q', value)
+        output = bytearray()
+        for field_name, value in data.items():
+            field_info = fields.get(field_name)
+            if field_info is None:
+                continue
             
-            return self._encode_varint(key) + value_bytes
+            self._encode_field(output, field_info, value)
+            if len(output) >= _OUTPUT_CHUNK:
+                yield output
+                output = bytearray()
         
-        return b''
+        if output:
+            yield output
     
-    def _encode_varint(self, value: int) -> bytes:
-        """Encode an integer as a varint."""
-        if value < 0:
-            value += (1 << 64)
+    def _encode_field(self, out: bytearray, field_info: ProtoFieldInfo, value: Any) -> None:
+        """Append a field to out in protobuf wire format."""
+        write_value = field_info.write_value
+        if write_value is None:
+            return
+        tag = field_info.tag_bytes
         
-        result = bytearray()
-        while value > 0x7f:
-            result.append((value & 0x7f) | 0x80)
-            value >>= 7
-        result.append(value & 0x7f)
-        return bytes(result)
+        if field_info.is_repeated():
+            for item in value:
+                out += tag
+                write_value(out, item)
+        else:
+            out += tag
+            write_value(out, value)
     
     def format_output(
         self,
         data: bytes,
         format_type: OutputFormat = OutputFormat.C_ARRAY,
-        name: str = "test_data"
-    ) -> str:
+        name: str = "test_data",
+        out: Optional[IO] = None
+    ) -> Optional[Union[str, bytes]]:
         """
         Format binary data for output.
         
@@ -1048,24 +1525,289 @@ class DataGenerator:
             data: Binary protobuf data
             format_type: Desired output format
             name: Variable name for C arrays
+            out: Optional file to write the output to, in chunks, instead of
+                 returning it. Must be opened in binary mode for BINARY and
+                 in text mode for the other formats.
         
         Returns:
-            Formatted string
+            Formatted string, or None if out was given
         """
+        if out is not None:
+            chunks = (data[i:i + _OUTPUT_CHUNK] for i in range(0, len(data), _OUTPUT_CHUNK))
+            self._write_output(out, chunks, format_type, name)
+            return None
+        
+        formatter = _FORMATTERS.get(format_type)
+        if formatter is None:
+            return str(data)
+        return formatter(data, name)
+    
+    @staticmethod
+    def _write_output(out: IO, chunks: Iterable[bytes], format_type: OutputFormat, name: str) -> None:
+        """Write formatted data to out chunk by chunk, like format_output() returns it."""
         if format_type == OutputFormat.BINARY:
-            return data
+            for chunk in chunks:
+                out.write(chunk)
         
         elif format_type == OutputFormat.HEX_STRING:
-            return data.hex()
+            for chunk in chunks:
+                out.write(chunk.hex())
         
         elif format_type == OutputFormat.C_ARRAY:
-            hex_values = ', '.join(f'0x{b:02x}' for b in data)
-            return f'const uint8_t {name}[] = {{{hex_values}}};\nconst size_t {name}_size = {len(data)};'
-        
-        elif format_type == OutputFormat.PYTHON_DICT:
-            return str(data)
+            out.write(f'const uint8_t {name}[] = {{')
+            size = 0
+            for chunk in chunks:
+                if size:
+                    out.write(', ')
+                out.write(_c_hex_literals(chunk))
+                size += len(chunk)
+            out.write(f'}};\nconst size_t {name}_size = {size};')
         
-        return str(data)
+        else:
+            out.write(str(b''.join(chunks)))
+
+
+def _generate_output(generator, message, invalid=False, fields=None, rules=None,
+                     seed=None, format_name='c_array', out=None):
+    """Generate, encode and format one message for the command line interface.
+
+    Returns a tuple of (formatted output, generated data dict). If out is
+    given, the output is written to it and None is returned in its place.
+    """
+    if invalid:
+        data_dict = generator.generate_invalid(
+            message,
+            violate_field=fields,
+            violate_rule=rules,
+            seed=seed
+        )
+    else:
+        data_dict = generator.generate_valid(message, seed=seed)
+    
+    # Encode and format output
+    output = generator.encode_and_format(
+        message,
+        data_dict,
+        _FORMAT_MAP[format_name],
+        f"{message.lower()}_data",
+        out
+    )
+    return output, data_dict
+
+
+def _run_batch(generator, args) -> int:
+    """Serve generation requests read as JSON lines from stdin.
+
+    Each line is an object with optional keys "message", "invalid",
+    "fields", "rules", "seed" and "format", defaulting to the command line
+    arguments. For each request, the output is written to stdout as a
+    4-byte little-endian length followed by that many bytes. Failed
+    requests produce an empty record and an error message on stderr.
+    """
+    import json
+
+    out = sys.stdout.buffer
+    status = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            output, _ = _generate_output(
+                generator,
+                request.get('message', args.message),
+                invalid=request.get('invalid', args.invalid),
+                fields=request.get('fields', args.fields),
+                rules=request.get('rules', args.rules),
+                seed=request.get('seed', args.seed),
+                format_name=request.get('format', args.format)
+            )
+            if isinstance(output, str):
+                output = output.encode('utf-8')
+        except Exception as e:
+            print(f"Error generating data: {e}", file=sys.stderr)
+            output = b''
+            status = 1
+        out.write(struct.pack('<I', len(output)))
+        out.write(output)
+        out.flush()
+    return status
+
+
+# Output format -> file extension for the files of a --count corpus
+_CORPUS_EXTENSIONS = {
+    'binary': 'bin',
+    'c_array': 'c',
+    'hex': 'hex',
+    'dict': 'txt',
+}
+
+# Generator of a worker process, set by _init_worker()
+_worker_generator = None
+
+
+def _init_worker(proto_file, include_paths):
+    """Load the proto file once in each worker process."""
+    global _worker_generator
+    _worker_generator = DataGenerator(proto_file, include_paths)
+
+
+def _generate_valid_worker(job) -> List[Dict[str, Any]]:
+    """Generate valid messages for a range of seeds in a worker process."""
+    message_name, seeds = job
+    return [_worker_generator.generate_valid(message_name, seed=seed) for seed in seeds]
+
+
+def _write_corpus_file(generator, args, index, seed) -> str:
+    """Generate the corpus file with the given index and seed, and return its path."""
+    binary = args.format == 'binary'
+    path = os.path.join(
+        args.output, f"{args.message.lower()}_{index}.{_CORPUS_EXTENSIONS[args.format]}"
+    )
+    with open(path, 'wb' if binary else 'w') as f:
+        _generate_output(
+            generator,
+            args.message,
+            invalid=args.invalid,
+            fields=args.fields,
+            rules=args.rules,
+            seed=seed,
+            format_name=args.format,
+            out=f
+        )
+        if not binary:
+            f.write('\n')
+    return path
+
+
+def _corpus_worker(job) -> str:
+    """Write one corpus file in a worker process."""
+    return _write_corpus_file(_worker_generator, *job)
+
+
+def _run_corpus(generator, args) -> int:
+    """Write args.count generated messages as files into the args.output directory.
+
+    Message i uses seed + i, so the corpus is reproducible when --seed is
+    given, regardless of the number of workers.
+    """
+    if not args.output:
+        print("Error: --count requires --output to name a directory", file=sys.stderr)
+        return 1
+    os.makedirs(args.output, exist_ok=True)
+
+    base_seed = args.seed if args.seed is not None else random.randrange(1 << 32)
+    jobs = [(args, i, base_seed + i) for i in range(args.count)]
+
+    if args.workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(jobs) // (args.workers * 4))
+        with ProcessPoolExecutor(max_workers=args.workers,
+                                 initializer=_init_worker,
+                                 initargs=(args.proto_file, args.include)) as executor:
+            for _ in executor.map(_corpus_worker, jobs, chunksize=chunksize):
+                pass
+    else:
+        for job in jobs:
+            _write_corpus_file(generator, *job)
+    return 0
+
+
+class _FdOutput:
+    """Minimal file object that writes to a file descriptor with os.write().
+
+    Writes are collected until _OUTPUT_CHUNK bytes are pending or flush()
+    is called, so that small pieces of output do not cost a system call each.
+    """
+    __slots__ = ('fd', 'encoding', 'errors', 'pending', 'pending_size')
+
+    def __init__(self, fd: int, encoding: Optional[str] = None, errors: str = 'strict'):
+        self.fd = fd
+        self.encoding = encoding
+        self.errors = errors
+        self.pending = []
+        self.pending_size = 0
+
+    def write(self, data: Union[str, bytes]) -> None:
+        if self.encoding is not None:
+            data = data.encode(self.encoding, self.errors)
+        self.pending.append(data)
+        self.pending_size += len(data)
+        if self.pending_size >= _OUTPUT_CHUNK:
+            self.flush()
+
+    def flush(self) -> None:
+        view = memoryview(b''.join(self.pending))
+        self.pending = []
+        self.pending_size = 0
+        while view:
+            view = view[os.write(self.fd, view):]
+
+
+def _stdout_output(binary: bool):
+    """Return a file object for stdout that bypasses the Python I/O layers when possible."""
+    stream = sys.stdout.buffer if binary else sys.stdout
+    try:
+        fd = stream.fileno()
+    except (AttributeError, ValueError, OSError):
+        # Replaced stdout, e.g. when captured by a test runner
+        return stream
+    stream.flush()
+    if binary:
+        return _FdOutput(fd)
+    # Encode text the same way sys.stdout would
+    encoding = getattr(stream, 'encoding', None)
+    if not encoding:
+        import locale
+        encoding = locale.getpreferredencoding(False)
+    return _FdOutput(fd, encoding, getattr(stream, 'errors', None) or 'strict')
+
+
+@contextlib.contextmanager
+def _open_output(path: Optional[str], binary: bool):
+    """Open the output file, or stdout if path is None.
+
+    A regular file is written to a temporary file in the same directory
+    that replaces it only when writing succeeds, so an error leaves an
+    existing file untouched. Other paths, such as /dev/null or a pipe,
+    are written directly.
+    """
+    if path is None:
+        out = _stdout_output(binary)
+        try:
+            yield out
+        finally:
+            out.flush()
+        return
+
+    mode = 'wb' if binary else 'w'
+    path = os.path.realpath(path)
+    if os.path.exists(path) and not os.path.isfile(path):
+        with open(path, mode) as out:
+            yield out
+        return
+
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + name + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, mode) as out:
+            yield out
+        # mkstemp() creates the file as private, give it the permissions
+        # open() would have
+        try:
+            permissions = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            permissions = 0o666 & ~umask
+        os.chmod(tmp_path, permissions)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 def main():
@@ -1089,14 +1831,33 @@ def main():
         '--rule', dest='rules', action='append', default=None,
         help='Rule(s) to violate (can be given multiple times or comma-separated)'
     )
-    parser.add_argument('--format', choices=['binary', 'c_array', 'hex', 'dict'],
+    parser.add_argument('--format', choices=list(_FORMAT_MAP),
                         default='c_array', help='Output format')
     parser.add_argument('--output', '-o', help='Output file (default: stdout)')
     parser.add_argument('--seed', type=int, help='Random seed for reproducibility')
     parser.add_argument('-I', '--include', action='append', default=[],
                         help='Include path for proto files')
+    parser.add_argument('--batch', action='store_true',
+                        help='Read JSON requests from stdin and write length-prefixed outputs')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Print the generated data, and tracebacks of errors, to stderr')
+    parser.add_argument('--count', type=int, default=None,
+                        help='Number of messages to write as files into the --output directory')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of worker processes used with --count (default: 1)')
     
     args = parser.parse_args()
+    if args.count is not None and args.count < 1:
+        parser.error('--count must be at least 1')
+    if args.workers is not None:
+        if args.count is None:
+            parser.error('--workers can only be used with --count')
+        if args.workers < 1:
+            parser.error('--workers must be at least 1')
+    else:
+        args.workers = 1
+    if args.count is None:
+        args.count = 1
     
     # Create generator
     try:
@@ -1105,57 +1866,42 @@ def main():
         print(f"Error loading proto file: {e}", file=sys.stderr)
         return 1
     
-    # Generate data
+    if args.batch:
+        return _run_batch(generator, args)
+    
+    if args.count > 1:
+        try:
+            return _run_corpus(generator, args)
+        except Exception as e:
+            print(f"Error generating data: {e}", file=sys.stderr)
+            return 1
+    
+    # Generate data and stream the output to the file or stdout
+    binary = args.format == 'binary'
     try:
-        if args.invalid:
-            data_dict = generator.generate_invalid(
+        with _open_output(args.output, binary) as out:
+            _, data_dict = _generate_output(
+                generator,
                 args.message,
-                violate_field=args.fields,
-                violate_rule=args.rules,
-                seed=args.seed
+                invalid=args.invalid,
+                fields=args.fields,
+                rules=args.rules,
+                seed=args.seed,
+                format_name=args.format,
+                out=out
             )
-        else:
-            data_dict = generator.generate_valid(args.message, seed=args.seed)
-        
-        # Encode to binary
-        binary_data = generator.encode_to_binary(args.message, data_dict)
-        
-        # Format output
-        format_map = {
-            'binary': OutputFormat.BINARY,
-            'c_array': OutputFormat.C_ARRAY,
-            'hex': OutputFormat.HEX_STRING,
-            'dict': OutputFormat.PYTHON_DICT,
-        }
-        
-        output = generator.format_output(
-            binary_data,
-            format_map[args.format],
-            f"{args.message.lower()}_data"
-        )
-        
-        # Write output
-        if args.output:
-            if args.format == 'binary':
-                with open(args.output, 'wb') as f:
-                    f.write(output)
-            else:
-                with open(args.output, 'w') as f:
-                    f.write(output)
-                    f.write('\n')
-        else:
-            if args.format == 'binary':
-                sys.stdout.buffer.write(output)
-            else:
-                print(output)
+            if not binary:
+                out.write('\n')
         
         # Print data dict to stderr for debugging
-        print(f"\n// Generated data: {data_dict}", file=sys.stderr)
+        if args.verbose:
+            print(f"\n// Generated data: {data_dict}", file=sys.stderr)
         
     except Exception as e:
-        print(f"Error generating data: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        print(f"Error generating data: {type(e).__name__}: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
         return 1
     
     return 0
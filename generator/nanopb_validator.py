@@ -140,11 +140,107 @@ _SUPPORTED_CALLBACK_STRING_RULES = frozenset({
     RULE_IN, RULE_NOT_IN,  # Set rules
 })
 
+# Rules read from the typed rule messages of validate.proto, in the order in
+# which they are emitted. Each entry is (rules field, rule type, constraint
+# suffix, kind), where kind is:
+#   'value'  - rule applies when the field is set; params {'value': ...}
+#   'values' - repeated field, applies when non-empty; params {'values': [...]}
+#   'flag'   - boolean, applies only when true; no params
+#   'true'   - boolean, applies only when true; params {'value': True}
+_NUMERIC_RULE_SPECS = (
+    ('const_value', RULE_EQ, 'const', 'value'),
+    ('lt', RULE_LT, 'lt', 'value'),
+    ('lte', RULE_LTE, 'lte', 'value'),
+    ('gt', RULE_GT, 'gt', 'value'),
+    ('gte', RULE_GTE, 'gte', 'value'),
+    ('in', RULE_IN, 'in', 'values'),
+    ('not_in', RULE_NOT_IN, 'not_in', 'values'),
+)
+
+_BOOL_RULE_SPECS = (
+    ('const_value', RULE_EQ, 'const', 'value'),
+)
+
+_STRING_RULE_SPECS = (
+    ('const_value', RULE_EQ, 'const', 'value'),
+    ('min_len', RULE_MIN_LEN, 'min_len', 'value'),
+    ('max_len', RULE_MAX_LEN, 'max_len', 'value'),
+    ('prefix', RULE_PREFIX, 'prefix', 'value'),
+    ('suffix', RULE_SUFFIX, 'suffix', 'value'),
+    ('contains', RULE_CONTAINS, 'contains', 'value'),
+    ('ascii', RULE_ASCII, 'ascii', 'flag'),
+    ('email', RULE_EMAIL, 'email', 'flag'),
+    ('hostname', RULE_HOSTNAME, 'hostname', 'flag'),
+    ('ip', RULE_IP, 'ip', 'flag'),
+    ('ipv4', RULE_IPV4, 'ipv4', 'flag'),
+    ('ipv6', RULE_IPV6, 'ipv6', 'flag'),
+    ('in', RULE_IN, 'in', 'values'),
+    ('not_in', RULE_NOT_IN, 'not_in', 'values'),
+)
+
+_BYTES_RULE_SPECS = (
+    ('const_value', RULE_EQ, 'const', 'value'),
+    ('min_len', RULE_MIN_LEN, 'min_len', 'value'),
+    ('max_len', RULE_MAX_LEN, 'max_len', 'value'),
+    ('prefix', RULE_PREFIX, 'prefix', 'value'),
+    ('suffix', RULE_SUFFIX, 'suffix', 'value'),
+    ('contains', RULE_CONTAINS, 'contains', 'value'),
+    ('in', RULE_IN, 'in', 'values'),
+    ('not_in', RULE_NOT_IN, 'not_in', 'values'),
+)
+
+_ENUM_RULE_SPECS = (
+    ('const_value', RULE_EQ, 'const', 'value'),
+    ('defined_only', RULE_ENUM_DEFINED, 'defined_only', 'value'),
+    ('in', RULE_IN, 'in', 'values'),
+    ('not_in', RULE_NOT_IN, 'not_in', 'values'),
+)
+
+# Items of a repeated enum only get defined_only when it is true
+_ENUM_ITEM_RULE_SPECS = (
+    ('const_value', RULE_EQ, 'const', 'value'),
+    ('defined_only', RULE_ENUM_DEFINED, 'defined_only', 'true'),
+    ('in', RULE_IN, 'in', 'values'),
+    ('not_in', RULE_NOT_IN, 'not_in', 'values'),
+)
+
+_NUMERIC_TYPES = (
+    'int32', 'int64', 'uint32', 'uint64',
+    'sint32', 'sint64', 'fixed32', 'fixed64',
+    'sfixed32', 'sfixed64', 'double', 'float'
+)
+
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+def _iter_set_rules(rules: Any, specs: Tuple[Tuple[str, str, str, str], ...]):
+    """
+    Yield (rule_type, constraint suffix, params) for each rule set in a rules message.
+    
+    The set fields are fetched with a single ListFields() call instead of
+    probing every possible rule with HasField().
+    
+    Args:
+        rules: A typed rules message from validate.proto (e.g. StringRules)
+        specs: One of the *_RULE_SPECS tables
+    """
+    present = {fd.name: value for fd, value in rules.ListFields()}
+    if not present:
+        return
+    for field_name, rule_type, suffix, kind in specs:
+        if field_name not in present:
+            continue
+        value = present[field_name]
+        if kind == 'value':
+            yield rule_type, suffix, {'value': value}
+        elif kind == 'values':
+            yield rule_type, suffix, {'values': list(value)}
+        elif value:
+            yield rule_type, suffix, {'value': value} if kind == 'true' else {}
+
+
 def _get_numeric_validator_info(type_name: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Map a protobuf numeric type name to its C type and validator function.
@@ -831,38 +927,34 @@ class FieldValidator:
         if not rules_option:
             return
         
+        # Fetch the set members once instead of probing each with HasField()
+        present = {fd.name: value for fd, value in rules_option.ListFields()}
+        if not present:
+            return
+        
         # Parse type-specific rules
-        if rules_option.HasField('string'):
-            self._parse_string_rules(rules_option.string)
-        if rules_option.HasField('bytes'):
-            self._parse_bytes_rules(rules_option.bytes)
-        if rules_option.HasField('bool'):
-            self._parse_bool_rules(rules_option.bool)
-        if rules_option.HasField('enum'):
-            self._parse_enum_rules(rules_option.enum)
-        if rules_option.HasField('repeated'):
-            self._parse_repeated_rules(rules_option.repeated)
-        if rules_option.HasField('map'):
-            self._parse_map_rules(rules_option.map)
-        if rules_option.HasField('any'):
-            self._parse_any_rules(rules_option.any)
-        if rules_option.HasField('timestamp'):
-            self._parse_timestamp_rules(rules_option.timestamp)
+        for name, parser in (
+            ('string', self._parse_string_rules),
+            ('bytes', self._parse_bytes_rules),
+            ('bool', self._parse_bool_rules),
+            ('enum', self._parse_enum_rules),
+            ('repeated', self._parse_repeated_rules),
+            ('map', self._parse_map_rules),
+            ('any', self._parse_any_rules),
+            ('timestamp', self._parse_timestamp_rules),
+        ):
+            if name in present:
+                parser(present[name])
         
         # Parse numeric rules for all numeric types (consolidated for clarity)
-        numeric_types = [
-            'int32', 'int64', 'uint32', 'uint64',
-            'sint32', 'sint64', 'fixed32', 'fixed64',
-            'sfixed32', 'sfixed64', 'double', 'float'
-        ]
-        for type_name in numeric_types:
-            if rules_option.HasField(type_name):
-                self._parse_numeric_rules(getattr(rules_option, type_name), type_name)
+        for type_name in _NUMERIC_TYPES:
+            if type_name in present:
+                self._parse_numeric_rules(present[type_name], type_name)
         
         # Parse field-level flags
-        if rules_option.HasField('required') and rules_option.required:
+        if present.get('required'):
             self.rules.append(ValidationRule(RULE_REQUIRED, 'required'))
-        if rules_option.HasField('oneof_required') and rules_option.oneof_required:
+        if present.get('oneof_required'):
             self.rules.append(ValidationRule(RULE_ONEOF_REQUIRED, 'oneof_required'))
     
     
@@ -877,20 +969,8 @@ class FieldValidator:
             rules: The numeric rules message (e.g., Int32Rules, FloatRules)
             type_name: The name of the numeric type (e.g., 'int32', 'float')
         """
-        if rules.HasField('const_value'):
-            self.rules.append(ValidationRule(RULE_EQ, f'{type_name}.const', {'value': rules.const_value}))
-        if rules.HasField('lt'):
-            self.rules.append(ValidationRule(RULE_LT, f'{type_name}.lt', {'value': rules.lt}))
-        if rules.HasField('lte'):
-            self.rules.append(ValidationRule(RULE_LTE, f'{type_name}.lte', {'value': rules.lte}))
-        if rules.HasField('gt'):
-            self.rules.append(ValidationRule(RULE_GT, f'{type_name}.gt', {'value': rules.gt}))
-        if rules.HasField('gte'):
-            self.rules.append(ValidationRule(RULE_GTE, f'{type_name}.gte', {'value': rules.gte}))
-        if hasattr(rules, 'in') and getattr(rules, 'in'):
-            self.rules.append(ValidationRule(RULE_IN, f'{type_name}.in', {'values': list(getattr(rules, 'in'))}))
-        if rules.not_in:
-            self.rules.append(ValidationRule(RULE_NOT_IN, f'{type_name}.not_in', {'values': list(rules.not_in)}))
+        for rule_type, suffix, params in _iter_set_rules(rules, _NUMERIC_RULE_SPECS):
+            self.rules.append(ValidationRule(rule_type, f'{type_name}.{suffix}', params))
     
     def _parse_bool_rules(self, rules: Any) -> None:
         """
@@ -899,8 +979,8 @@ class FieldValidator:
         Args:
             rules: The BoolRules message from validate.proto
         """
-        if rules.HasField('const_value'):
-            self.rules.append(ValidationRule(RULE_EQ, 'bool.const', {'value': rules.const_value}))
+        for rule_type, suffix, params in _iter_set_rules(rules, _BOOL_RULE_SPECS):
+            self.rules.append(ValidationRule(rule_type, f'bool.{suffix}', params))
     
     def _parse_string_rules(self, rules: Any) -> None:
         """
@@ -912,34 +992,8 @@ class FieldValidator:
         Args:
             rules: The StringRules message from validate.proto
         """
-        if rules.HasField('const_value'):
-            self.rules.append(ValidationRule(RULE_EQ, 'string.const', {'value': rules.const_value}))
-        if rules.HasField('min_len'):
-            self.rules.append(ValidationRule(RULE_MIN_LEN, 'string.min_len', {'value': rules.min_len}))
-        if rules.HasField('max_len'):
-            self.rules.append(ValidationRule(RULE_MAX_LEN, 'string.max_len', {'value': rules.max_len}))
-        if rules.HasField('prefix'):
-            self.rules.append(ValidationRule(RULE_PREFIX, 'string.prefix', {'value': rules.prefix}))
-        if rules.HasField('suffix'):
-            self.rules.append(ValidationRule(RULE_SUFFIX, 'string.suffix', {'value': rules.suffix}))
-        if rules.HasField('contains'):
-            self.rules.append(ValidationRule(RULE_CONTAINS, 'string.contains', {'value': rules.contains}))
-        if rules.HasField('ascii') and rules.ascii:
-            self.rules.append(ValidationRule(RULE_ASCII, 'string.ascii'))
-        if getattr(rules, 'email', False):
-            self.rules.append(ValidationRule(RULE_EMAIL, 'string.email'))
-        if getattr(rules, 'hostname', False):
-            self.rules.append(ValidationRule(RULE_HOSTNAME, 'string.hostname'))
-        if getattr(rules, 'ip', False):
-            self.rules.append(ValidationRule(RULE_IP, 'string.ip'))
-        if getattr(rules, 'ipv4', False):
-            self.rules.append(ValidationRule(RULE_IPV4, 'string.ipv4'))
-        if getattr(rules, 'ipv6', False):
-            self.rules.append(ValidationRule(RULE_IPV6, 'string.ipv6'))
-        if hasattr(rules, 'in') and getattr(rules, 'in'):
-            self.rules.append(ValidationRule(RULE_IN, 'string.in', {'values': list(getattr(rules, 'in'))}))
-        if rules.not_in:
-            self.rules.append(ValidationRule(RULE_NOT_IN, 'string.not_in', {'values': list(rules.not_in)}))
+        for rule_type, suffix, params in _iter_set_rules(rules, _STRING_RULE_SPECS):
+            self.rules.append(ValidationRule(rule_type, f'string.{suffix}', params))
     
     def _parse_bytes_rules(self, rules: Any) -> None:
         """
@@ -950,22 +1004,8 @@ class FieldValidator:
         Args:
             rules: The BytesRules message from validate.proto
         """
-        if rules.HasField('const_value'):
-            self.rules.append(ValidationRule(RULE_EQ, 'bytes.const', {'value': rules.const_value}))
-        if rules.HasField('min_len'):
-            self.rules.append(ValidationRule(RULE_MIN_LEN, 'bytes.min_len', {'value': rules.min_len}))
-        if rules.HasField('max_len'):
-            self.rules.append(ValidationRule(RULE_MAX_LEN, 'bytes.max_len', {'value': rules.max_len}))
-        if rules.HasField('prefix'):
-            self.rules.append(ValidationRule(RULE_PREFIX, 'bytes.prefix', {'value': rules.prefix}))
-        if rules.HasField('suffix'):
-            self.rules.append(ValidationRule(RULE_SUFFIX, 'bytes.suffix', {'value': rules.suffix}))
-        if rules.HasField('contains'):
-            self.rules.append(ValidationRule(RULE_CONTAINS, 'bytes.contains', {'value': rules.contains}))
-        if hasattr(rules, 'in') and getattr(rules, 'in'):
-            self.rules.append(ValidationRule(RULE_IN, 'bytes.in', {'values': list(getattr(rules, 'in'))}))
-        if rules.not_in:
-            self.rules.append(ValidationRule(RULE_NOT_IN, 'bytes.not_in', {'values': list(rules.not_in)}))
+        for rule_type, suffix, params in _iter_set_rules(rules, _BYTES_RULE_SPECS):
+            self.rules.append(ValidationRule(rule_type, f'bytes.{suffix}', params))
     
     def _parse_enum_rules(self, rules: Any) -> None:
         """
@@ -977,14 +1017,8 @@ class FieldValidator:
         Args:
             rules: The EnumRules message from validate.proto
         """
-        if rules.HasField('const_value'):
-            self.rules.append(ValidationRule(RULE_EQ, 'enum.const', {'value': rules.const_value}))
-        if rules.HasField('defined_only'):
-            self.rules.append(ValidationRule(RULE_ENUM_DEFINED, 'enum.defined_only', {'value': rules.defined_only}))
-        if hasattr(rules, 'in') and getattr(rules, 'in'):
-            self.rules.append(ValidationRule(RULE_IN, 'enum.in', {'values': list(getattr(rules, 'in'))}))
-        if rules.not_in:
-            self.rules.append(ValidationRule(RULE_NOT_IN, 'enum.not_in', {'values': list(rules.not_in)}))
+        for rule_type, suffix, params in _iter_set_rules(rules, _ENUM_RULE_SPECS):
+            self.rules.append(ValidationRule(rule_type, f'enum.{suffix}', params))
     
     def _parse_repeated_rules(self, rules: Any) -> None:
         """
@@ -1024,14 +1058,15 @@ class FieldValidator:
             A list of dictionaries, each representing one per-item constraint
         """
         result = []
+        present = {fd.name: value for fd, value in items_rules.ListFields()}
         
         # Extract rules for each type that might be in the items
-        if items_rules.HasField('string'):
-            result.extend(self._extract_string_item_rules(items_rules.string))
-        if items_rules.HasField('bool'):
-            result.extend(self._extract_bool_item_rules(items_rules.bool))
-        if items_rules.HasField('enum'):
-            result.extend(self._extract_enum_item_rules(items_rules.enum))
+        if 'string' in present:
+            result.extend(self._extract_string_item_rules(present['string']))
+        if 'bool' in present:
+            result.extend(self._extract_bool_item_rules(present['bool']))
+        if 'enum' in present:
+            result.extend(self._extract_enum_item_rules(present['enum']))
         
         # Extract numeric item rules for all numeric types (consolidated)
         numeric_types = [
@@ -1040,84 +1075,38 @@ class FieldValidator:
             'sfixed32', 'sfixed64', 'float', 'double'
         ]
         for type_name in numeric_types:
-            if items_rules.HasField(type_name):
-                result.extend(self._extract_numeric_item_rules(
-                    getattr(items_rules, type_name), type_name
-                ))
+            if type_name in present:
+                result.extend(self._extract_numeric_item_rules(present[type_name], type_name))
         
         return result
     
     def _extract_string_item_rules(self, rules: Any) -> List[Dict[str, Any]]:
         """Extract string validation rules for repeated items."""
-        result = []
-        if rules.HasField('const_value'):
-            result.append({'rule': RULE_EQ, 'constraint_id': 'string.const', 'value': rules.const_value})
-        if rules.HasField('min_len'):
-            result.append({'rule': RULE_MIN_LEN, 'constraint_id': 'string.min_len', 'value': rules.min_len})
-        if rules.HasField('max_len'):
-            result.append({'rule': RULE_MAX_LEN, 'constraint_id': 'string.max_len', 'value': rules.max_len})
-        if rules.HasField('prefix'):
-            result.append({'rule': RULE_PREFIX, 'constraint_id': 'string.prefix', 'value': rules.prefix})
-        if rules.HasField('suffix'):
-            result.append({'rule': RULE_SUFFIX, 'constraint_id': 'string.suffix', 'value': rules.suffix})
-        if rules.HasField('contains'):
-            result.append({'rule': RULE_CONTAINS, 'constraint_id': 'string.contains', 'value': rules.contains})
-        if rules.HasField('ascii') and rules.ascii:
-            result.append({'rule': RULE_ASCII, 'constraint_id': 'string.ascii'})
-        if getattr(rules, 'email', False):
-            result.append({'rule': RULE_EMAIL, 'constraint_id': 'string.email'})
-        if getattr(rules, 'hostname', False):
-            result.append({'rule': RULE_HOSTNAME, 'constraint_id': 'string.hostname'})
-        if getattr(rules, 'ip', False):
-            result.append({'rule': RULE_IP, 'constraint_id': 'string.ip'})
-        if getattr(rules, 'ipv4', False):
-            result.append({'rule': RULE_IPV4, 'constraint_id': 'string.ipv4'})
-        if getattr(rules, 'ipv6', False):
-            result.append({'rule': RULE_IPV6, 'constraint_id': 'string.ipv6'})
-        if hasattr(rules, 'in') and getattr(rules, 'in'):
-            result.append({'rule': RULE_IN, 'constraint_id': 'string.in', 'values': list(getattr(rules, 'in'))})
-        if rules.not_in:
-            result.append({'rule': RULE_NOT_IN, 'constraint_id': 'string.not_in', 'values': list(rules.not_in)})
-        return result
+        return [
+            {'rule': rule_type, 'constraint_id': f'string.{suffix}', **params}
+            for rule_type, suffix, params in _iter_set_rules(rules, _STRING_RULE_SPECS)
+        ]
     
     def _extract_numeric_item_rules(self, rules: Any, type_name: str) -> List[Dict[str, Any]]:
         """Extract numeric validation rules for repeated items."""
-        result = []
-        if rules.HasField('const_value'):
-            result.append({'rule': RULE_EQ, 'constraint_id': f'{type_name}.const', 'value': rules.const_value})
-        if rules.HasField('lt'):
-            result.append({'rule': RULE_LT, 'constraint_id': f'{type_name}.lt', 'value': rules.lt})
-        if rules.HasField('lte'):
-            result.append({'rule': RULE_LTE, 'constraint_id': f'{type_name}.lte', 'value': rules.lte})
-        if rules.HasField('gt'):
-            result.append({'rule': RULE_GT, 'constraint_id': f'{type_name}.gt', 'value': rules.gt})
-        if rules.HasField('gte'):
-            result.append({'rule': RULE_GTE, 'constraint_id': f'{type_name}.gte', 'value': rules.gte})
-        if hasattr(rules, 'in') and getattr(rules, 'in'):
-            result.append({'rule': RULE_IN, 'constraint_id': f'{type_name}.in', 'values': list(getattr(rules, 'in'))})
-        if rules.not_in:
-            result.append({'rule': RULE_NOT_IN, 'constraint_id': f'{type_name}.not_in', 'values': list(rules.not_in)})
-        return result
+        return [
+            {'rule': rule_type, 'constraint_id': f'{type_name}.{suffix}', **params}
+            for rule_type, suffix, params in _iter_set_rules(rules, _NUMERIC_RULE_SPECS)
+        ]
     
     def _extract_bool_item_rules(self, rules: Any) -> List[Dict[str, Any]]:
         """Extract bool validation rules for repeated items."""
-        result = []
-        if rules.HasField('const_value'):
-            result.append({'rule': RULE_EQ, 'constraint_id': 'bool.const', 'value': rules.const_value})
-        return result
+        return [
+            {'rule': rule_type, 'constraint_id': f'bool.{suffix}', **params}
+            for rule_type, suffix, params in _iter_set_rules(rules, _BOOL_RULE_SPECS)
+        ]
     
     def _extract_enum_item_rules(self, rules: Any) -> List[Dict[str, Any]]:
         """Extract enum validation rules for repeated items."""
-        result = []
-        if rules.HasField('const_value'):
-            result.append({'rule': RULE_EQ, 'constraint_id': 'enum.const', 'value': rules.const_value})
-        if rules.HasField('defined_only') and rules.defined_only:
-            result.append({'rule': RULE_ENUM_DEFINED, 'constraint_id': 'enum.defined_only', 'value': rules.defined_only})
-        if hasattr(rules, 'in') and getattr(rules, 'in'):
-            result.append({'rule': RULE_IN, 'constraint_id': 'enum.in', 'values': list(getattr(rules, 'in'))})
-        if rules.not_in:
-            result.append({'rule': RULE_NOT_IN, 'constraint_id': 'enum.not_in', 'values': list(rules.not_in)})
-        return result
+        return [
+            {'rule': rule_type, 'constraint_id': f'enum.{suffix}', **params}
+            for rule_type, suffix, params in _iter_set_rules(rules, _ENUM_ITEM_RULE_SPECS)
+        ]
     
     def _parse_map_rules(self, rules: Any) -> None:
         """
@@ -1,15 +1,15 @@
 '''This file dynamically builds the proto definitions for Python.'''
-from __future__ import absolute_import
 
 import os
 import os.path
 import sys
-import tempfile
-import shutil
-import traceback
-from tempfile import TemporaryDirectory
+import importlib
+import importlib.util
 from ._utils import has_grpcio_protoc, invoke_protoc, print_versions
 
+# Module returned by the first successful load_nanopb_pb2() call
+_LOADED = None
+
 def build_nanopb_proto(protosrc, dirname):
     '''Try to build one or more .proto files for python-protobuf.
     protosrc can be a single path or list/tuple of paths.
@@ -22,23 +22,143 @@ def build_nanopb_proto(protosrc, dirname):
     else:
         sources = [protosrc]
 
-    cmd = ["protoc", "--python_out={}".format(dirname)] + sources + ["-I={}".format(dirname)]
+    cmd = ["protoc", f"--python_out={dirname}", *sources, f"-I={dirname}"]
 
     if has_grpcio_protoc():
         # grpcio-tools has an extra CLI argument
         # from grpc.tools.protoc __main__ invocation.
-        cmd.append("-I={}".format(_utils.get_grpc_tools_proto_path()))
+        cmd.append(f"-I={_utils.get_grpc_tools_proto_path()}")
 
+    # All sources are compiled in one protoc run. When grpcio-tools is
+    # installed, invoke_protoc() calls its protoc.main() in-process and
+    # no external process is started.
     try:
         invoke_protoc(argv=cmd)
-    except:
-        sys.stderr.write("Failed to build nanopb_pb2.py: " + ' '.join(cmd) + "\n")
-        sys.stderr.write(traceback.format_exc() + "\n")
+    except Exception as e:
+        _report_exception("Failed to build nanopb_pb2.py: " + ' '.join(cmd), e)
         return False
 
     return True
 
+def _report_exception(message, e):
+    '''Write a one-line error report to stderr. The full traceback is
+    only printed if NANOPB_PB2_DEBUG is set.
+    '''
+    sys.stderr.write(f"{message}: {type(e).__name__}: {e}\n")
+    if os.getenv("NANOPB_PB2_DEBUG") not in (None, "", "0"):
+        import traceback
+        traceback.print_exc()
+
+def __getattr__(name):
+    # TemporaryDirectory is re-exported for the generator scripts, but
+    # tempfile is only imported when it is actually asked for.
+    if name == "TemporaryDirectory":
+        from tempfile import TemporaryDirectory
+        return TemporaryDirectory
+
+    # The generated modules are built on first access, so that importing
+    # this package alone never runs protoc. Note that "from . import x"
+    # probes this hook before importing the submodule, so the loader code
+    # below uses importlib.import_module() instead.
+    if name == "nanopb_pb2":
+        return load_nanopb_pb2()
+    if name == "validate_pb2":
+        # Use an existing module if there is one, and only build the
+        # generated modules if neither import works.
+        for attempt in range(2):
+            try:
+                return importlib.import_module(__name__ + ".validate_pb2")
+            except ImportError:
+                pass
+            try:
+                # Prebuilt module on sys.path, e.g. with NANOPB_PB2_NO_REBUILD
+                return importlib.import_module("validate_pb2")
+            except ImportError:
+                pass
+            if attempt == 0:
+                load_nanopb_pb2()
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def _try_build_and_import(sources, outdir, from_file = False):
+    '''Build sources into outdir and import the resulting nanopb_pb2.
+    If from_file is set, the module is loaded directly from outdir as a
+    top-level module instead of being imported from this package.
+    Returns the module, or None if importing it failed.
+    '''
+    build_nanopb_proto(sources, outdir)
+
+    try:
+        if not from_file:
+            return importlib.import_module(__name__ + ".nanopb_pb2")
+
+        # Load by path rather than adding outdir to sys.path, which would
+        # make every later import in the process probe this directory.
+        spec = importlib.util.spec_from_file_location("nanopb_pb2", os.path.join(outdir, "nanopb_pb2.py"))
+        nanopb_pb2_mod = importlib.util.module_from_spec(spec)
+        sys.modules["nanopb_pb2"] = nanopb_pb2_mod
+        try:
+            spec.loader.exec_module(nanopb_pb2_mod)
+        except:
+            del sys.modules["nanopb_pb2"]
+            raise
+        return nanopb_pb2_mod
+    except Exception as e:
+        _report_exception("Failed to import %s" % os.path.join(outdir, "nanopb_pb2.py"), e)
+        return None
+
+def _safe_stat(path):
+    '''Return os.stat() result for path, or None if it does not exist.'''
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def _sources_digest(paths):
+    '''Return a hex digest of the contents of the given files.'''
+    import hashlib
+    digest = hashlib.blake2b()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def _read_file(path):
+    '''Return the text content of path, or None if it cannot be read.'''
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _write_file(path, text):
+    '''Write text to path, ignoring failures (e.g. read-only install).'''
+    try:
+        with open(path, 'w') as f:
+            f.write(text)
+    except OSError:
+        pass
+
 def load_nanopb_pb2():
+    '''Load nanopb_pb2, building it if necessary. The module is loaded
+    only once per process, later calls return the same module.
+    '''
+    global _LOADED
+    if _LOADED is not None:
+        return _LOADED
+
+    if os.getenv("NANOPB_PB2_NO_REBUILD") not in (None, "", "0", "false", "False"):
+        # Don't attempt to autogenerate nanopb_pb2.py, external build rules
+        # should have already done so.
+        import nanopb_pb2 as nanopb_pb2_mod
+        _LOADED = nanopb_pb2_mod
+        return nanopb_pb2_mod
+
+    nanopb_pb2_mod = _load_nanopb_pb2()
+    _LOADED = nanopb_pb2_mod
+    return nanopb_pb2_mod
+
+def _load_nanopb_pb2():
     # To work, the generator needs python-protobuf built version of nanopb.proto.
     # There are three methods to provide this:
     #
@@ -50,6 +170,14 @@ def load_nanopb_pb2():
     # If NANOPB_PB2_TEMP_DIR environment variable is defined, the 2) is skipped.
     # If the value of the $NANOPB_PB2_TEMP_DIR exists as a directory, it is used instead
     # of system temp folder.
+    #
+    # If NANOPB_PB2_CACHE_STYLE=hash, a hash of the .proto sources is stored in
+    # nanopb_pb2.py.stamp after building, and the generated files are trusted
+    # whenever it matches, even if file timestamps have been reset (e.g. by a
+    # fresh git checkout or an artifact copy in CI).
+    #
+    # Build and import errors are reported on one line. Set NANOPB_PB2_DEBUG=1
+    # to get full tracebacks.
 
     tmpdir = os.getenv("NANOPB_PB2_TEMP_DIR")
     temporary_only = (tmpdir is not None)
@@ -58,65 +186,66 @@ def load_nanopb_pb2():
     protodst = os.path.join(dirname, "nanopb_pb2.py")
     validatesrc = os.path.join(dirname, "validate.proto")
     validatedst = os.path.join(dirname, "validate_pb2.py")
+    stampfile = protodst + ".stamp"
+    use_hash_stamp = (os.getenv("NANOPB_PB2_CACHE_STYLE") == "hash")
 
     if tmpdir is not None and not os.path.isdir(tmpdir):
         tmpdir = None # Use system-wide temp dir
 
-    no_rebuild = bool(int(os.getenv("NANOPB_PB2_NO_REBUILD", default = 0)))
-    if bool(no_rebuild):
-        # Don't attempt to autogenerate nanopb_pb2.py, external build rules
-        # should have already done so.
-        import nanopb_pb2 as nanopb_pb2_mod
-        return nanopb_pb2_mod
+    # Stat each file only once and compare integer nanosecond timestamps
+    protosrc_st = _safe_stat(protosrc)
+    protodst_st = _safe_stat(protodst)
+    validatesrc_st = _safe_stat(validatesrc)
+    validatedst_st = _safe_stat(validatedst)
+
+    # Each generated file is up to date if it exists and is newer than its source
+    nanopb_up_to_date = (protosrc_st is not None and protodst_st is not None and
+                         protodst_st.st_mtime_ns >= protosrc_st.st_mtime_ns)
+    validate_up_to_date = (validatesrc_st is None) or \
+                          (validatedst_st is not None and validatedst_st.st_mtime_ns >= validatesrc_st.st_mtime_ns)
+
+    sources_digest = None
+    if use_hash_stamp and protosrc_st is not None:
+        sources_digest = _sources_digest([protosrc] + ([validatesrc] if validatesrc_st is not None else []))
+        if (protodst_st is not None and (validatesrc_st is None or validatedst_st is not None) and
+                _read_file(stampfile) == sources_digest):
+            nanopb_up_to_date = validate_up_to_date = True
+
+    if nanopb_up_to_date and validate_up_to_date:
+        try:
+            nanopb_pb2_mod = importlib.import_module(__name__ + ".nanopb_pb2")
+            return nanopb_pb2_mod
+        except Exception as e:
+            sys.stderr.write("Failed to import nanopb_pb2.py: " + str(e) + "\n"
+                             "Will automatically attempt to rebuild this.\n"
+                             "Verify that python-protobuf and protoc versions match.\n")
+            print_versions()
 
-    if os.path.isfile(protosrc):
-        src_date = os.path.getmtime(protosrc)
-        validate_up_to_date = (not os.path.isfile(validatesrc)) or \
-                               (os.path.isfile(validatedst) and os.path.getmtime(validatedst) >= os.path.getmtime(validatesrc))
-        if os.path.isfile(protodst) and os.path.getmtime(protodst) >= src_date and validate_up_to_date:
-            try:
-                from . import nanopb_pb2 as nanopb_pb2_mod
-                # If validate.proto exists but not built (older installs), attempt lazy import to see if it's present
-                if os.path.isfile(validatesrc) and not os.path.isfile(validatedst):
-                    # Trigger build of validate.proto only
-                    build_nanopb_proto([validatesrc], dirname)
-                return nanopb_pb2_mod
-            except Exception as e:
-                sys.stderr.write("Failed to import nanopb_pb2.py: " + str(e) + "\n"
-                                 "Will automatically attempt to rebuild this.\n"
-                                 "Verify that python-protobuf and protoc versions match.\n")
-                print_versions()
-
-    # Try to rebuild into generator/proto directory (nanopb.proto + validate.proto if available)
+            # Existing files are unusable, rebuild everything
+            nanopb_up_to_date = validate_up_to_date = False
+
+    # Try to rebuild into generator/proto directory, only the sources that are out of date
     if not temporary_only:
-        sources = [protosrc]
-        if os.path.isfile(validatesrc):
+        sources = []
+        if not nanopb_up_to_date:
+            sources.append(protosrc)
+        if not validate_up_to_date:
             sources.append(validatesrc)
-        build_nanopb_proto(sources, dirname)
-
-        try:
-            from . import nanopb_pb2 as nanopb_pb2_mod
+        nanopb_pb2_mod = _try_build_and_import(sources, dirname)
+        if nanopb_pb2_mod is not None:
+            if sources_digest is not None:
+                _write_file(stampfile, sources_digest)
             return nanopb_pb2_mod
-        except:
-            sys.stderr.write("Failed to import generator/proto/nanopb_pb2.py:\n")
-            sys.stderr.write(traceback.format_exc() + "\n")
 
     # Try to rebuild into temporary directory
+    from tempfile import TemporaryDirectory
     with TemporaryDirectory(prefix = 'nanopb-', dir = tmpdir) as protodir:
         sources = [protosrc]
-        if os.path.isfile(validatesrc):
+        if validatesrc_st is not None:
             sources.append(validatesrc)
-        build_nanopb_proto(sources, protodir)
-
-        if protodir not in sys.path:
-            sys.path.insert(0, protodir)
-
-        try:
-            import nanopb_pb2 as nanopb_pb2_mod
+        nanopb_pb2_mod = _try_build_and_import(sources, protodir, from_file = True)
+        if nanopb_pb2_mod is not None:
             return nanopb_pb2_mod
-        except:
-            sys.stderr.write("Failed to import %s/nanopb_pb2.py:\n" % protodir)
-            sys.stderr.write(traceback.format_exc() + "\n")
 
     # If everything fails
     sys.stderr.write("\n\nGenerating nanopb_pb2.py failed.\n")
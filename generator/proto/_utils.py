@@ -1,6 +1,7 @@
 import sys
 import subprocess
 import os.path
+import functools
 
 import traceback
 
@@ -10,15 +11,28 @@ try:
 except ImportError:
     pass
 
+@functools.lru_cache(maxsize=1)
+def _grpcio_protoc_import_error():
+    # type: () -> typing.Optional[ImportError]
+    """ imports grpcio-tools protoc once, returns the exception if it failed"""
+
+    try:
+        import grpc_tools.protoc
+    except ImportError as e:
+        return e
+
+    return None
+
 def has_grpcio_protoc(verbose = False):
     # type: () -> bool
     """ checks if grpcio-tools protoc is installed"""
 
-    try:
-        import grpc_tools.protoc
-    except ImportError:
+    error = _grpcio_protoc_import_error()
+    if error is not None:
         if verbose:
-            sys.stderr.write("Failed to import grpc_tools: %s\n" % traceback.format_exc())
+            # The traceback is only formatted when it is actually printed
+            text = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+            sys.stderr.write("Failed to import grpc_tools: %s\n" % text)
         return False
 
     return True
@@ -0,0 +1,122 @@
+"""Shared setup for the nanopb_data_generator tests.
+
+The tests use the .proto files of tests/validation and need protoc and
+python-protobuf, like the generator itself.
+"""
+
+import functools
+import ipaddress
+import os
+import re
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATOR_DIR = os.path.join(os.path.dirname(TESTS_DIR), 'generator')
+VALIDATION_DIR = os.path.join(TESTS_DIR, 'validation')
+DATA_GENERATOR = os.path.join(GENERATOR_DIR, 'nanopb_data_generator.py')
+
+if GENERATOR_DIR not in sys.path:
+    sys.path.insert(0, GENERATOR_DIR)
+
+from nanopb_data_generator import DataGenerator  # noqa: E402
+
+
+def validation_proto(name):
+    """Return the path of tests/validation/<name>.proto."""
+    return os.path.join(VALIDATION_DIR, name + '.proto')
+
+
+@functools.lru_cache(maxsize=None)
+def load_generator(name):
+    """Return a DataGenerator for tests/validation/<name>.proto.
+
+    Protos that only the data generator tests use, such as
+    string_edge_cases, are looked up in this directory instead.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), name + '.proto')
+    if not os.path.exists(path):
+        path = validation_proto(name)
+    return DataGenerator(path, [VALIDATION_DIR])
+
+
+def _add_file(pool, file_proto):
+    """Add file_proto and, from the default pool, its missing imports to pool."""
+    from google.protobuf import descriptor_pb2, descriptor_pool
+
+    for dependency in file_proto.dependency:
+        try:
+            pool.FindFileByName(dependency)
+        except KeyError:
+            dependency_proto = descriptor_pb2.FileDescriptorProto()
+            descriptor_pool.Default().FindFileByName(dependency).CopyToProto(dependency_proto)
+            _add_file(pool, dependency_proto)
+    pool.Add(file_proto)
+
+
+@functools.lru_cache(maxsize=None)
+def message_class(name, message):
+    """Return the python-protobuf class of a message in tests/validation/<name>.proto."""
+    from google.protobuf import descriptor_pool, message_factory
+
+    file_proto = load_generator(name).file_descriptor
+    pool = descriptor_pool.DescriptorPool()
+    _add_file(pool, file_proto)
+    full_name = file_proto.package + '.' + message if file_proto.package else message
+    return message_factory.GetMessageClass(pool.FindMessageTypeByName(full_name))
+
+
+_HOSTNAME_LABEL = re.compile(r'^[A-Za-z0-9]([A-Za-z0-9-]{0,61}[A-Za-z0-9])?$')
+
+
+def _is_hostname(value):
+    return 0 < len(value) <= 253 and all(_HOSTNAME_LABEL.match(label) for label in value.split('.'))
+
+
+def _is_ip(value, version=None):
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return version is None or address.version == version
+
+
+def _item_rule_holds(rule, expected, value):
+    """Check one rule that applies to a single (non-repeated) value."""
+    if rule in ('min_len', 'max_len'):
+        length = len(value)
+        return length >= expected if rule == 'min_len' else length <= expected
+    checks = {
+        'const': lambda: value == expected,
+        'in': lambda: value in expected,
+        'not_in': lambda: value not in expected,
+        'gt': lambda: value > expected,
+        'gte': lambda: value >= expected,
+        'lt': lambda: value < expected,
+        'lte': lambda: value <= expected,
+        'prefix': lambda: value.startswith(expected),
+        'suffix': lambda: value.endswith(expected),
+        'contains': lambda: expected in value,
+        'ascii': lambda: all(ord(c) < 128 for c in value),
+        'email': lambda: value.count('@') == 1 and len(value.split('@')[0]) > 0
+                         and _is_hostname(value.split('@')[1]),
+        'hostname': lambda: _is_hostname(value),
+        'ip': lambda: _is_ip(value),
+        'ipv4': lambda: _is_ip(value, 4),
+        'ipv6': lambda: _is_ip(value, 6),
+    }
+    return checks[rule]()
+
+
+def rule_holds(field_info, constraint, value):
+    """Return True if value, the value of field_info, satisfies constraint."""
+    rule = constraint.rule_type
+    if not field_info.is_repeated():
+        return _item_rule_holds(rule, constraint.value, value)
+
+    if rule == 'min_items':
+        return len(value) >= constraint.value
+    if rule == 'max_items':
+        return len(value) <= constraint.value
+    if rule == 'unique':
+        return len(set(value)) == len(value)
+    return all(_item_rule_holds(rule, constraint.value, item) for item in value)
@@ -0,0 +1,71 @@
+"""Tests for the --batch mode of the command line interface."""
+
+import json
+import struct
+import subprocess
+import sys
+import unittest
+
+from generator_test_utils import DATA_GENERATOR, VALIDATION_DIR, load_generator, validation_proto
+from nanopb_data_generator import OutputFormat
+
+
+def read_records(data):
+    """Split --batch output into its length-prefixed records."""
+    records = []
+    pos = 0
+    while pos < len(data):
+        (length,) = struct.unpack_from('<I', data, pos)
+        pos += 4
+        records.append(data[pos:pos + length])
+        pos += length
+    # The last record must end exactly at the end of the output
+    assert pos == len(data), 'truncated record'
+    return records
+
+
+class BatchModeTests(unittest.TestCase):
+    def run_batch(self, requests, *args):
+        stdin = ''.join(json.dumps(request) + '\n' for request in requests)
+        result = subprocess.run(
+            [sys.executable, DATA_GENERATOR, validation_proto('numeric_rules'), 'Int32Rules',
+             '-I', VALIDATION_DIR, '--batch'] + list(args),
+            input=stdin.encode('utf-8'), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            check=False,
+        )
+        return result.returncode, read_records(result.stdout), result.stderr
+
+    def test_round_trip(self):
+        generator = load_generator('numeric_rules')
+        status, records, _ = self.run_batch([
+            {'seed': 1},
+            {'invalid': True, 'fields': ['range_field'], 'rules': ['lte'], 'seed': 2},
+            {'seed': 1, 'format': 'hex'},
+        ], '--format', 'binary')
+
+        self.assertEqual(status, 0)
+        valid = generator.encode_to_binary(
+            'Int32Rules', generator.generate_valid('Int32Rules', seed=1))
+        invalid = generator.encode_to_binary('Int32Rules', generator.generate_invalid(
+            'Int32Rules', violate_field=['range_field'], violate_rule=['lte'], seed=2))
+        self.assertEqual(records, [
+            valid,
+            invalid,
+            generator.format_output(valid, OutputFormat.HEX_STRING).encode('ascii'),
+        ])
+
+    def test_failed_request(self):
+        status, records, stderr = self.run_batch([
+            {'message': 'NoSuchMessage'},
+            {'seed': 3},
+        ], '--format', 'binary')
+
+        self.assertEqual(status, 1)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0], b'')
+        self.assertNotEqual(records[1], b'')
+        self.assertIn(b'NoSuchMessage', stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
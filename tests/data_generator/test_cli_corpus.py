@@ -0,0 +1,112 @@
+"""Tests for writing a corpus of files with --count and --workers."""
+
+import ast
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from generator_test_utils import (DATA_GENERATOR, VALIDATION_DIR, load_generator,
+                                  message_class, validation_proto)
+
+# Extensions the corpus files are expected to use for each --format
+EXTENSIONS = {'binary': 'bin', 'c_array': 'c', 'hex': 'hex', 'dict': 'txt'}
+
+
+def decode_file(path, format_name):
+    """Return the encoded message stored in a corpus file."""
+    if format_name == 'binary':
+        with open(path, 'rb') as f:
+            return f.read()
+    with open(path) as f:
+        text = f.read()
+    if format_name == 'hex':
+        return bytes.fromhex(text.strip())
+    if format_name == 'dict':
+        return ast.literal_eval(text.strip())
+    # C array: the bytes are the literals between the braces
+    literals = text[text.index('{') + 1:text.index('}')].replace(',', ' ').split()
+    return bytes(int(literal, 16) for literal in literals)
+
+
+class CorpusTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def run_corpus(self, output, count, *args):
+        return subprocess.run(
+            [sys.executable, DATA_GENERATOR, validation_proto('numeric_rules'), 'Int32Rules',
+             '-I', VALIDATION_DIR]
+            + (['--count', str(count)] if count is not None else [])
+            + (['--output', output] if output else []) + list(args),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
+        )
+
+    def read_corpus(self, directory):
+        contents = {}
+        for name in os.listdir(directory):
+            with open(os.path.join(directory, name), 'rb') as f:
+                contents[name] = f.read()
+        return contents
+
+    def test_file_names_and_contents(self):
+        generator = load_generator('numeric_rules')
+        cls = message_class('numeric_rules', 'Int32Rules')
+        for format_name, extension in EXTENSIONS.items():
+            with self.subTest(format=format_name):
+                output = os.path.join(self.tmpdir.name, format_name)
+                result = self.run_corpus(output, 4, '--seed', '10', '--format', format_name)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                self.assertEqual(sorted(os.listdir(output)),
+                                 ['int32rules_%d.%s' % (i, extension) for i in range(4)])
+
+                for i in range(4):
+                    data = decode_file(os.path.join(output, 'int32rules_%d.%s' % (i, extension)),
+                                       format_name)
+                    expected = generator.generate_valid('Int32Rules', seed=10 + i)
+                    self.assertEqual(data, generator.encode_to_binary('Int32Rules', expected))
+                    message = cls.FromString(data)
+                    for name, value in expected.items():
+                        self.assertEqual(getattr(message, name), value)
+
+    def test_workers_write_same_files(self):
+        serial = os.path.join(self.tmpdir.name, 'serial')
+        parallel = os.path.join(self.tmpdir.name, 'parallel')
+        for output, workers in ((serial, '1'), (parallel, '3')):
+            result = self.run_corpus(output, 12, '--seed', '5', '--format', 'binary',
+                                     '--invalid', '--workers', workers)
+            self.assertEqual(result.returncode, 0, result.stderr)
+
+        self.assertEqual(len(os.listdir(parallel)), 12)
+        self.assertEqual(self.read_corpus(parallel), self.read_corpus(serial))
+
+    def test_output_directory_required(self):
+        result = self.run_corpus(None, 3)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn(b'--output', result.stderr)
+
+    def assert_usage_error(self, result, message):
+        self.assertEqual(result.returncode, 2)
+        self.assertIn(message, result.stderr)
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_count_must_be_positive(self):
+        output = os.path.join(self.tmpdir.name, 'corpus')
+        self.assert_usage_error(self.run_corpus(output, 0), b'--count must be at least 1')
+        self.assert_usage_error(self.run_corpus(output, -3), b'--count must be at least 1')
+
+    def test_workers_must_be_positive(self):
+        output = os.path.join(self.tmpdir.name, 'corpus')
+        self.assert_usage_error(self.run_corpus(output, 3, '--workers', '0'),
+                                b'--workers must be at least 1')
+
+    def test_workers_requires_count(self):
+        output = os.path.join(self.tmpdir.name, 'out.txt')
+        self.assert_usage_error(self.run_corpus(output, None, '--workers', '2'),
+                                b'--workers can only be used with --count')
+
+
+if __name__ == '__main__':
+    unittest.main()
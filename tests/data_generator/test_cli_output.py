@@ -0,0 +1,44 @@
+"""Tests for writing single-message output with --output."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from generator_test_utils import DATA_GENERATOR, VALIDATION_DIR, validation_proto
+
+
+class OutputFileTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'out.txt')
+
+    def run_generator(self, *args):
+        return subprocess.run(
+            [sys.executable, DATA_GENERATOR, validation_proto('numeric_rules'), 'Int32Rules',
+             '-I', VALIDATION_DIR, '--output', self.path] + list(args),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
+        )
+
+    def test_output_is_written(self):
+        result = self.run_generator('--seed', '1', '--format', 'hex')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        with open(self.path) as f:
+            bytes.fromhex(f.read().strip())
+        self.assertEqual(os.listdir(self.tmpdir.name), ['out.txt'])
+
+    def test_error_keeps_existing_file(self):
+        with open(self.path, 'w') as f:
+            f.write('previous output\n')
+        result = self.run_generator('--invalid', '--field', 'no_such_field')
+        self.assertEqual(result.returncode, 1)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), 'previous output\n')
+        # No temporary file is left behind
+        self.assertEqual(os.listdir(self.tmpdir.name), ['out.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
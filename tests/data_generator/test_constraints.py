@@ -0,0 +1,115 @@
+"""Tests for parsing (validate.rules) and for generate_valid/generate_invalid."""
+
+import glob
+import os
+import unittest
+
+from generator_test_utils import VALIDATION_DIR, load_generator, rule_holds
+
+PROTO_NAMES = sorted(
+    os.path.splitext(os.path.basename(path))[0]
+    for path in glob.glob(os.path.join(VALIDATION_DIR, '*.proto'))
+)
+
+
+class ConstraintParsingTests(unittest.TestCase):
+    def constraints(self, proto, message, field):
+        info = load_generator(proto).get_field_info(message, field)
+        return {c.rule_type: c.value for c in info.constraints}
+
+    def test_numeric_rules(self):
+        self.assertEqual(self.constraints('numeric_rules', 'Int32Rules', 'range_field'),
+                         {'gte': 0, 'lte': 150})
+        self.assertEqual(self.constraints('numeric_rules', 'Int32Rules', 'const_field'),
+                         {'const': 42})
+        self.assertEqual(self.constraints('numeric_rules', 'UInt64Rules', 'gte_field'),
+                         {'gte': 1})
+        self.assertEqual(self.constraints('numeric_rules', 'SInt32Rules', 'gt_field'),
+                         {'gt': -100})
+        self.assertEqual(self.constraints('numeric_rules', 'DoubleRules', 'lte_field'),
+                         {'lte': 1.0})
+
+    def test_string_rules(self):
+        self.assertEqual(self.constraints('string_rules', 'StringRules', 'range_len_field'),
+                         {'min_len': 3, 'max_len': 20})
+        self.assertEqual(self.constraints('string_rules', 'StringRules', 'prefix_field'),
+                         {'prefix': 'PREFIX_'})
+        self.assertEqual(self.constraints('string_rules', 'StringRules', 'email_field'),
+                         {'email': True})
+        self.assertEqual(self.constraints('string_rules', 'StringRules', 'in_field'),
+                         {'in': ('red', 'green', 'blue')})
+
+    def test_bytes_rules(self):
+        self.assertEqual(self.constraints('bytes_rules', 'BytesRules', 'range_len_field'),
+                         {'min_len': 4, 'max_len': 64})
+
+    def test_repeated_rules(self):
+        info = load_generator('repeated_rules').get_field_info('RepeatedAllConstraints', 'numbers')
+        self.assertTrue(info.is_repeated())
+        self.assertEqual({c.rule_type: c.value for c in info.constraints},
+                         {'min_items': 1, 'max_items': 10, 'unique': True, 'gte': 0, 'lte': 1000})
+        self.assertEqual(info.constraint_rules_set,
+                         {'min_items', 'max_items', 'unique', 'gte', 'lte'})
+        # Item rules apply to each element, list rules to the whole field
+        self.assertEqual(info.item_constraints_dict, {'gte': 0, 'lte': 1000})
+
+    def test_field_without_rules(self):
+        generator = load_generator('numeric_rules')
+        for info in generator.get_all_fields('Int32Rules').values():
+            if info.name not in ('lt_field', 'lte_field', 'gt_field', 'gte_field',
+                                 'const_field', 'range_field'):
+                self.assertEqual(info.constraints, ())
+
+
+class GeneratedDataTests(unittest.TestCase):
+    def test_valid_data_satisfies_all_rules(self):
+        for proto in PROTO_NAMES:
+            generator = load_generator(proto)
+            for message in generator.get_messages():
+                fields = generator.get_all_fields(message)
+                for seed in range(20):
+                    data = generator.generate_valid(message, seed=seed)
+                    for name, info in fields.items():
+                        for constraint in info.constraints:
+                            with self.subTest(message=message, field=name,
+                                              rule=constraint.rule_type, seed=seed):
+                                self.assertIn(name, data)
+                                self.assertTrue(rule_holds(info, constraint, data[name]),
+                                                data[name])
+
+    def test_invalid_data_violates_targeted_rule(self):
+        for proto in PROTO_NAMES:
+            generator = load_generator(proto)
+            for message in generator.get_messages():
+                for name, info in generator.get_all_fields(message).items():
+                    for constraint in info.constraints:
+                        for seed in range(5):
+                            with self.subTest(message=message, field=name,
+                                              rule=constraint.rule_type, seed=seed):
+                                data = generator.generate_invalid(
+                                    message, violate_field=name,
+                                    violate_rule=constraint.rule_type, seed=seed)
+                                self.assertFalse(rule_holds(info, constraint, data[name]),
+                                                 data[name])
+
+    def test_invalid_data_keeps_other_fields_valid(self):
+        generator = load_generator('numeric_rules')
+        fields = generator.get_all_fields('Int32Rules')
+        data = generator.generate_invalid('Int32Rules', violate_field='range_field',
+                                          violate_rule='lte', seed=3)
+        for name, info in fields.items():
+            if name == 'range_field':
+                continue
+            for constraint in info.constraints:
+                self.assertTrue(rule_holds(info, constraint, data[name]))
+
+    def test_seed_is_reproducible(self):
+        generator = load_generator('string_rules')
+        self.assertEqual(generator.generate_valid('StringRules', seed=7),
+                         generator.generate_valid('StringRules', seed=7))
+        self.assertEqual(generator.generate_invalid('StringRules', seed=7),
+                         generator.generate_invalid('StringRules', seed=7))
+
+
+if __name__ == '__main__':
+    unittest.main()
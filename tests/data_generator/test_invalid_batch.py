@@ -0,0 +1,60 @@
+"""Tests for DataGenerator.generate_invalid_batch()."""
+
+import unittest
+
+from generator_test_utils import load_generator, rule_holds
+
+
+def violated_rules(generator, message, data):
+    """Return the (field, rule) pairs of message that data violates."""
+    return {
+        (name, constraint.rule_type)
+        for name, info in generator.get_all_fields(message).items()
+        for constraint in info.constraints
+        if not rule_holds(info, constraint, data[name])
+    }
+
+
+class InvalidBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.generator = load_generator('numeric_rules')
+
+    def test_batch_size(self):
+        self.assertEqual(len(list(self.generator.generate_invalid_batch('Int32Rules', 25, seed=1))), 25)
+        self.assertEqual(list(self.generator.generate_invalid_batch('Int32Rules', 0, seed=1)), [])
+
+    def test_seed_is_reproducible(self):
+        first = list(self.generator.generate_invalid_batch('Int32Rules', 10, seed=5))
+        second = list(self.generator.generate_invalid_batch('Int32Rules', 10, seed=5))
+        other = list(self.generator.generate_invalid_batch('Int32Rules', 10, seed=6))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_items_violate_requested_rule(self):
+        batch = list(self.generator.generate_invalid_batch(
+            'Int32Rules', 20, violate_field='range_field', violate_rule='lte', seed=2))
+        for data in batch:
+            self.assertEqual(violated_rules(self.generator, 'Int32Rules', data),
+                             {('range_field', 'lte')})
+
+        # All items are derived from the same valid base message
+        for name in ('lt_field', 'gt_field', 'const_field'):
+            self.assertEqual(len({data[name] for data in batch}), 1)
+
+    def test_items_violate_all_requested_fields(self):
+        for data in self.generator.generate_invalid_batch(
+                'Int32Rules', 10, violate_field='lt_field,gt_field', seed=3):
+            self.assertEqual(violated_rules(self.generator, 'Int32Rules', data),
+                             {('lt_field', 'lt'), ('gt_field', 'gt')})
+
+    def test_random_violation(self):
+        for data in self.generator.generate_invalid_batch('Int32Rules', 30, seed=4):
+            self.assertEqual(len(violated_rules(self.generator, 'Int32Rules', data)), 1)
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self.generator.generate_invalid_batch('Int32Rules', 1, violate_field='no_such_field')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""Regression tests for max_len and not_in edge cases of string generation."""
+
+import unittest
+
+from generator_test_utils import load_generator
+
+SEEDS = range(200)
+
+
+class StringEdgeCaseTests(unittest.TestCase):
+    def setUp(self):
+        self.generator = load_generator('string_edge_cases')
+
+    def test_affixes_are_truncated_to_max_len(self):
+        for seed in SEEDS:
+            data = self.generator.generate_valid('LongAffixes', seed=seed)
+            self.assertEqual(data['affixes'], 'PREFIX__SU')
+            self.assertEqual(data['contains'], 'ab@@')
+
+    def test_empty_body_does_not_return_forbidden_value(self):
+        values = set()
+        for seed in SEEDS:
+            data = self.generator.generate_valid('ForbiddenShortValues', seed=seed)
+            self.assertNotEqual(data['no_empty'], '')
+            self.assertLessEqual(len(data['no_empty']), 2)
+            self.assertNotEqual(data['no_prefix_only'], 'id_')
+            self.assertTrue(data['no_prefix_only'].startswith('id_'))
+            self.assertLessEqual(len(data['no_prefix_only']), 4)
+            values.add(data['no_empty'])
+        # The repair must not collapse the field to a single value
+        self.assertGreater(len(values), 1)
+
+    def test_unsatisfiable_not_in_raises(self):
+        with self.assertRaises(ValueError):
+            self.generator.generate_valid('Unsatisfiable', seed=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+"""Tests for DataGenerator.generate_valid_batch()."""
+
+import unittest
+
+from generator_test_utils import load_generator
+
+
+class ValidBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.generator = load_generator('repeated_rules')
+
+    def test_items_match_generate_valid(self):
+        batch = self.generator.generate_valid_batch('RepeatedAllConstraints', 5, base_seed=10)
+        self.assertEqual(len(batch), 5)
+        for i, data in enumerate(batch):
+            self.assertEqual(data, self.generator.generate_valid('RepeatedAllConstraints', seed=10 + i))
+
+    def test_workers_do_not_change_result(self):
+        for message in ('RepeatedAllConstraints', 'RepeatedStringItems'):
+            serial = self.generator.generate_valid_batch(message, 40, base_seed=3, workers=1)
+            parallel = self.generator.generate_valid_batch(message, 40, base_seed=3, workers=3)
+            self.assertEqual(parallel, serial)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.generator.generate_valid_batch('RepeatedAllConstraints', 0, workers=2), [])
+
+    def test_unknown_message(self):
+        with self.assertRaises(ValueError):
+            self.generator.generate_valid_batch('NoSuchMessage', 3, workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()